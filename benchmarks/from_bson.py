@@ -0,0 +1,106 @@
+"""Document.from_bson against the previous dict walk implementation
+
+run: python -m benchmarks.from_bson
+"""
+import datetime
+import timeit
+
+from bson import DBRef, ObjectId, encode, decode as bson_decode
+from bson.raw_bson import RawBSONDocument
+from msgspec import Struct, from_builtins
+
+from chouodm.codec import BUILTIN_TYPES
+from chouodm.document import Document
+from chouodm.hooks import dec_hook
+from chouodm.types import Relation
+
+NUMBER = 20000
+
+
+class Config(Struct):
+    path: str = "/home/"
+    env: str = "test"
+
+
+class Author(Document):
+    name: str
+
+
+class Book(Document):
+    title: str
+    pages: int
+    price: float
+    created: datetime.datetime
+    tags: list
+    meta: dict
+    author: Relation[Author]
+
+
+class Shelf(Document):
+    name: str
+    config: Config
+
+
+def legacy_from_bson(cls, bson_raw_data: RawBSONDocument) -> Document:
+    data = bson_decode(bson_raw_data.raw)
+    if cls.has_relations:
+        for field, info in cls.__relation_info__.items():
+            row_data = data[field]
+            if row_data:
+                rel = (
+                    [Relation.validate(r, info.document_class) for r in row_data]
+                    if isinstance(row_data, list)
+                    else Relation.validate(row_data, info.document_class)
+                )
+                data[field] = rel
+            else:
+                data[field] = None
+    return cls(**data)
+
+
+def builtins_from_bson(cls, bson_raw_data: RawBSONDocument) -> Document:
+    # whole decoded dict validated by msgspec, relations through dec_hook
+    return from_builtins(
+        bson_decode(bson_raw_data.raw),
+        cls,
+        builtin_types=BUILTIN_TYPES,
+        dec_hook=dec_hook,
+    )
+
+
+RAW = RawBSONDocument(
+    encode(
+        {
+            "_id": ObjectId(),
+            "title": "lord of the rings",
+            "pages": 1216,
+            "price": 19.9,
+            "created": datetime.datetime(2020, 1, 1),
+            "tags": ["fantasy", "classic"],
+            "meta": {"isbn": "978-0-618-64015-7"},
+            "author": DBRef("author", ObjectId()),
+        }
+    )
+)
+
+SHELF_RAW = RawBSONDocument(
+    encode({"_id": ObjectId(), "name": "fantasy", "config": {"path": "/books/"}})
+)
+
+
+def run(name: str, func) -> float:
+    best = min(timeit.repeat(func, number=NUMBER, repeat=15)) / NUMBER * 1e6
+    print(f"{name:<10} {best:.2f} us/doc")
+    return best
+
+
+if __name__ == "__main__":
+    Book.from_bson(RAW)
+    baseline = run("decode", lambda: bson_decode(RAW.raw))
+    legacy = run("legacy", lambda: legacy_from_bson(Book, RAW))
+    builtins = run("builtins", lambda: builtins_from_bson(Book, RAW))
+    current = run("from_bson", lambda: Book.from_bson(RAW))
+    print(f"speedup    {legacy / current:.2f}x (bson decode floor {baseline:.2f} us)")
+    print(f"over floor {current - baseline:.2f} us, builtins {builtins - baseline:.2f}")
+    # legacy path left nested Structs as dicts, so only the new one is timed
+    run("nested", lambda: Shelf.from_bson(SHELF_RAW))
@@ -0,0 +1,77 @@
+"""generate_basic_query with compiled plan cache against the previous per-call parsing
+
+run: python -m benchmarks.query_plan
+"""
+import timeit
+
+from bson import ObjectId
+
+from chouodm.document import Document
+from chouodm.query import ExtraQueryMapper, generate_basic_query
+from chouodm.validation import validate_field_value
+
+NUMBER = 20000
+
+
+class Ticket(Document):
+    name: str
+    position: int
+    config: dict
+    sign: int = 1
+
+
+def legacy_generate_basic_query(manager, query, with_validate_document_fields=True):
+    query_params: dict = {}
+    for query_field, value in query.items():
+        field, *extra_params = query_field.split("__")
+        inners, extra_params = manager._parse_extra_params(extra_params)
+        if with_validate_document_fields and not manager._validate_field(field):
+            continue
+        extra = ExtraQueryMapper(manager.document, field).query(extra_params, value)
+        if extra:
+            value = extra[field]
+        elif field == "_id":
+            value = ObjectId(value)
+        else:
+            value = (
+                validate_field_value(manager.document, field, value)
+                if not inners
+                else value
+            )
+        if inners:
+            field = f'{field}.{".".join(i for i in inners)}'
+        if (
+            extra
+            and field in query_params
+            and ("__gt" in query_field or "__lt" in query_field)
+        ):
+            query_params[field].update(value)
+        else:
+            query_params[field] = value
+    return query_params
+
+
+QUERY = {
+    "name": "second",
+    "position__gte": 1,
+    "position__lt": 10,
+    "config__param1": "value",
+    "sign__in": [1, 2, 3],
+    "_id__ne": str(ObjectId()),
+}
+
+
+def run(name: str, func) -> float:
+    best = min(timeit.repeat(func, number=NUMBER, repeat=7)) / NUMBER * 1e6
+    print(f"{name:<8} {best:.2f} us/query")
+    return best
+
+
+if __name__ == "__main__":
+    manager = Ticket.manager
+    assert generate_basic_query(manager, QUERY) == legacy_generate_basic_query(
+        manager, QUERY
+    )
+    legacy = run("legacy", lambda: legacy_generate_basic_query(manager, QUERY))
+    current = run("plan", lambda: generate_basic_query(manager, QUERY))
+    print(f"speedup  {legacy / current:.2f}x")
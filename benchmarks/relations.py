@@ -0,0 +1,84 @@
+"""relation loading: find(_id__in) per class and level against one $lookup aggregation
+
+needs running mongodb, url can be set with MONGO_URL
+run: python -m benchmarks.relations
+"""
+import asyncio
+import os
+import time
+from typing import List
+
+from chouodm.connection import connect
+from chouodm.document import Document
+from chouodm.types import Relation
+
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://127.0.0.1:27017")
+COMPANIES = 10
+PEOPLE = 500
+TEAMS = 200
+ROUNDS = 20
+
+
+class BenchCompany(Document):
+    name: str
+
+
+class BenchPerson(Document):
+    name: str
+    company: Relation[BenchCompany]
+
+
+class BenchTeam(Document):
+    name: str
+    company: Relation[BenchCompany]
+    members: List[Relation[BenchPerson]]
+
+
+async def fill() -> None:
+    companies = [BenchCompany(name=f"company{i}") for i in range(COMPANIES)]
+    for company in companies:
+        await company.save()
+    people = [
+        BenchPerson(name=f"person{i}", company=companies[i % COMPANIES])
+        for i in range(PEOPLE)
+    ]
+    await BenchPerson.Q().insert_many(people)
+    people = (await BenchPerson.Q().find()).list
+    teams = [
+        BenchTeam(
+            name=f"team{i}",
+            company=companies[i % COMPANIES],
+            members=[people[(i * 7 + j) % PEOPLE] for j in range(10)],
+        )
+        for i in range(TEAMS)
+    ]
+    await BenchTeam.Q().insert_many(teams)
+
+
+async def run(strategy: str) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = await BenchTeam.Q().find(
+            with_relations_objects=True, relation_strategy=strategy
+        )
+        best = min(best, time.perf_counter() - start)
+    assert all(isinstance(m, BenchPerson) for t in result for m in t.members)
+    print(f"{strategy:<8} {best * 1e3:.2f} ms/find ({TEAMS} teams)")
+    return best
+
+
+async def main() -> None:
+    connect(MONGO_URL, "chouodm_benchmarks")
+    try:
+        await fill()
+        in_ = await run("in")
+        lookup = await run("lookup")
+        print(f"lookup   {in_ / lookup:.2f}x")
+    finally:
+        for document in (BenchCompany, BenchPerson, BenchTeam):
+            await document.Q().drop_collection(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,210 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from bson import ObjectId
+from motor.core import AgnosticCollection
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+
+__all__ = ("BatchMetrics", "WriteBatcher")
+
+# marks update operations in waiting results, inserts wait for their _id
+_UPDATE = object()
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+
+class BatchMetrics(object):
+    """counters of flushed batches, batch sizes are bucketed by powers of two"""
+
+    __slots__ = (
+        "batches",
+        "operations",
+        "max_size",
+        "full_batches",
+        "failed_operations",
+        "size_buckets",
+    )
+
+    def __init__(self):
+        self.batches = 0
+        self.operations = 0
+        self.max_size = 0
+        # batches sent because max size was reached before delay
+        self.full_batches = 0
+        self.failed_operations = 0
+        # upper bound of bucket (1, 2, 4, 8, ...) -> batches count
+        self.size_buckets: Dict[int, int] = {}
+
+    def record(self, size: int, full: bool) -> None:
+        self.batches += 1
+        self.operations += size
+        if size > self.max_size:
+            self.max_size = size
+        if full:
+            self.full_batches += 1
+        bucket = 1 << (size - 1).bit_length()
+        self.size_buckets[bucket] = self.size_buckets.get(bucket, 0) + 1
+
+    @property
+    def mean_size(self) -> float:
+        return self.operations / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "operations": self.operations,
+            "mean_size": self.mean_size,
+            "max_size": self.max_size,
+            "full_batches": self.full_batches,
+            "failed_operations": self.failed_operations,
+            "size_buckets": dict(sorted(self.size_buckets.items())),
+        }
+
+    def __repr__(self) -> str:
+        return f"BatchMetrics({self.as_dict()})"
+
+
+def _write_error(error: dict) -> WriteError:
+    code = error.get("code")
+    error_class = DuplicateKeyError if code == DUPLICATE_KEY_ERROR_CODE else WriteError
+    return error_class(error.get("errmsg"), code, error)
+
+
+class WriteBatcher(object):
+    """coalesces inserts and updates of concurrent coroutines for one collection
+
+    Operations wait for max_delay seconds or until max_size operations are
+    collected and then are sent as one unordered bulk_write. Every caller
+    gets its own result: inserted _id or error of its own operation.
+
+    Server reports only total modified count of bulk write, so update result
+    is exact only when all or none of successful updates in batch modified
+    document, None otherwise.
+    """
+
+    __slots__ = (
+        "collection",
+        "max_size",
+        "max_delay",
+        "metrics",
+        "_operations",
+        "_waiting",
+        "_timer",
+        "_tasks",
+    )
+
+    def __init__(
+        self, collection: AgnosticCollection, max_size: int, max_delay: float
+    ):
+        self.collection = collection
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.metrics = BatchMetrics()
+        self._operations: List[Union[InsertOne, UpdateOne]] = []
+        # (future, inserted _id or _UPDATE) for every operation
+        self._waiting: List[Tuple[asyncio.Future, Any]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def _add(
+        self, operation: Union[InsertOne, UpdateOne], result: Any
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._operations.append(operation)
+        self._waiting.append((future, result))
+        if len(self._operations) >= self.max_size:
+            self._flush(full=True)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return future
+
+    async def insert(self, data: dict) -> ObjectId:
+        """insert document data, _id is generated if not set
+
+        Returns:
+            ObjectId: inserted document _id
+        """
+        object_id = data.get("_id")
+        if object_id is None:
+            object_id = data["_id"] = ObjectId()
+        return await self._add(InsertOne(data), object_id)
+
+    async def update(self, filter: dict, update: dict, **kwargs) -> Optional[int]:
+        """update one document, kwargs are passed to pymongo UpdateOne
+
+        Returns:
+            Optional[int]: modified count, None if it cant be taken from batch result
+        """
+        return await self._add(UpdateOne(filter, update, **kwargs), _UPDATE)
+
+    def _flush(self, full: bool = False) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._operations:
+            return
+        operations, waiting = self._operations, self._waiting
+        self._operations, self._waiting = [], []
+        task = asyncio.ensure_future(self._write(operations, waiting, full))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """send waiting operations now and wait until all batches are written"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _write(
+        self,
+        operations: List[Union[InsertOne, UpdateOne]],
+        waiting: List[Tuple[asyncio.Future, Any]],
+        full: bool,
+    ) -> None:
+        self.metrics.record(len(operations), full)
+        try:
+            result = await self.collection.bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            if details.get("writeConcernErrors"):
+                self._reject(waiting, e)
+                return
+        except Exception as e:
+            self._reject(waiting, e)
+            return
+        errors = {error["index"]: error for error in details.get("writeErrors", ())}
+        updates = sum(
+            1
+            for index, (_, result) in enumerate(waiting)
+            if result is _UPDATE and index not in errors
+        )
+        modified_total = details.get("nModified", 0)
+        modified: Optional[int] = None
+        if modified_total == 0:
+            modified = 0
+        elif modified_total == updates:
+            modified = 1
+        for index, (future, result) in enumerate(waiting):
+            if future.done():
+                continue
+            error = errors.get(index)
+            if error is not None:
+                self.metrics.failed_operations += 1
+                future.set_exception(_write_error(error))
+            elif result is _UPDATE:
+                future.set_result(modified)
+            else:
+                future.set_result(result)
+
+    def _reject(
+        self, waiting: List[Tuple[asyncio.Future, Any]], error: Exception
+    ) -> None:
+        self.metrics.failed_operations += len(waiting)
+        for future, _ in waiting:
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,186 @@
+import datetime
+from decimal import Decimal
+from uuid import UUID
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from bson import DBRef
+from msgspec import json, inspect, from_builtins, to_builtins, ValidationError
+from typing_extensions import get_type_hints
+
+from .hooks import enc_hook, dec_hook
+from .types import Relation
+
+if TYPE_CHECKING:
+    from .document import Document
+    from .typing import DocumentType
+
+__all__ = ("DocumentCodec", "HydrationPlan", "get_codec")
+
+
+# types passed through as is when input data is normalized to builtins
+BUILTIN_TYPES = (
+    bytes,
+    bytearray,
+    datetime.datetime,
+    datetime.date,
+    datetime.time,
+    UUID,
+    Decimal,
+)
+
+# enc_hook does not depend on document class, so one encoder is shared
+_encoder = json.Encoder(enc_hook=enc_hook)
+
+
+class DocumentCodec(object):
+    """compiled msgspec codecs for one Document class
+
+    Decoders are built on first use (annotations may still contain forward
+    references while the class body is being created) and then reused.
+    """
+
+    __slots__ = (
+        "document_class",
+        "partial_types",
+        "lookup_plans",
+        "_decoder",
+        "_list_decoder",
+        "_hydration_plan",
+    )
+
+    def __init__(self, document_class: "DocumentType"):
+        self.document_class = document_class
+        # projected Struct types by selected fields, see projection.py
+        self.partial_types: Dict[Tuple[str, ...], Any] = {}
+        # $lookup plans by (prefetch paths, max_depth), see lookup.py
+        self.lookup_plans: Dict[Tuple[Any, Any], Any] = {}
+        self._decoder: Optional[json.Decoder] = None
+        self._list_decoder: Optional[json.Decoder] = None
+        self._hydration_plan: Optional["HydrationPlan"] = None
+
+    @property
+    def encoder(self) -> json.Encoder:
+        return _encoder
+
+    @property
+    def decoder(self) -> json.Decoder:
+        if self._decoder is None:
+            self._decoder = json.Decoder(self.document_class, dec_hook=dec_hook)
+        return self._decoder
+
+    @property
+    def list_decoder(self) -> json.Decoder:
+        if self._list_decoder is None:
+            self._list_decoder = json.Decoder(
+                List[self.document_class], dec_hook=dec_hook  # type: ignore
+            )
+        return self._list_decoder
+
+    def convert(self, data: dict) -> "Document":
+        """validating dict -> Document conversion without json round trip"""
+        try:
+            return from_builtins(data, self.document_class, dec_hook=dec_hook)
+        except ValidationError:
+            # Struct instances, sets or enum members are accepted only in their
+            # builtin form, so normalize input and validate once again
+            data = to_builtins(data, builtin_types=BUILTIN_TYPES, enc_hook=enc_hook)
+            return from_builtins(data, self.document_class, dec_hook=dec_hook)
+
+    @property
+    def hydration_plan(self) -> "HydrationPlan":
+        if self._hydration_plan is None:
+            self._hydration_plan = HydrationPlan(self.document_class)
+        return self._hydration_plan
+
+
+def _contains_struct(inspected: Any) -> bool:
+    if isinstance(inspected, inspect.StructType):
+        return True
+    if isinstance(inspected, inspect.UnionType):
+        return any(_contains_struct(t) for t in inspected.types)
+    if isinstance(inspected, inspect.DictType):
+        return _contains_struct(inspected.value_type)
+    if isinstance(inspected, inspect.TupleType):
+        return any(_contains_struct(t) for t in inspected.item_types)
+    item_type = getattr(inspected, "item_type", None)
+    return item_type is not None and _contains_struct(item_type)
+
+
+def _to_relation(value: Any, document_class: "DocumentType") -> Relation:
+    if isinstance(value, DBRef):
+        return Relation(value, document_class)
+    return Relation.validate(value, document_class)
+
+
+def _relation_converter(document_class: "DocumentType") -> Callable:
+    def convert(value: Any) -> Any:
+        if not value:
+            return None
+        if isinstance(value, list):
+            return [_to_relation(v, document_class) for v in value]
+        return _to_relation(value, document_class)
+
+    return convert
+
+
+def _struct_converter(field_type: Any) -> Callable:
+    def convert(value: Any) -> Any:
+        return from_builtins(value, field_type, dec_hook=dec_hook)
+
+    return convert
+
+
+class HydrationPlan(object):
+    """per-class plan for building Document from decoded bson
+
+    Only fields which need conversion (relations and nested Structs) are
+    visited, all other values are passed to the Struct constructor as is.
+    bson.decode is most of the cost, the plan only removes the relation walk:
+    up to about 1.2x and often within noise, see benchmarks/from_bson.py.
+    from_builtins on the whole decoded dict is slower: it validates every
+    value and passes ObjectId and DBRef through dec_hook.
+    """
+
+    __slots__ = ("document_class", "converters", "field_converters")
+
+    def __init__(self, document_class: "DocumentType"):
+        self.document_class = document_class
+        self.converters: Tuple[Tuple[str, Callable], ...] = self._compile(
+            document_class
+        )
+        self.field_converters: Dict[str, Callable] = dict(self.converters)
+
+    @staticmethod
+    def _compile(document_class: "DocumentType") -> Tuple[Tuple[str, Callable], ...]:
+        relation_info = document_class.__relation_info__
+        converters = [
+            (field, _relation_converter(info.document_class))
+            for field, info in relation_info.items()
+        ]
+        hints = get_type_hints(document_class, include_extras=True)
+        for field in document_class.__struct_fields__:
+            if field in relation_info or field not in hints:
+                continue
+            field_type = hints[field]
+            if _contains_struct(inspect.type_info(field_type)):
+                converters.append((field, _struct_converter(field_type)))
+        return tuple(converters)
+
+    def hydrate(self, data: dict) -> "Document":
+        for field, converter in self.converters:
+            if field in data:
+                data[field] = converter(data[field])
+        return self.document_class(**data)
+
+
+def get_codec(document_class: "DocumentType") -> DocumentCodec:
+    """returns codec registered for document_class
+
+    Codec is looked up in class __dict__ only, so subclasses never reuse
+    codecs compiled for their parents.
+    """
+    codec = document_class.__dict__.get("__codec__")
+    if codec is None:
+        codec = DocumentCodec(document_class)
+        setattr(document_class, "__codec__", codec)
+    return codec
@@ -0,0 +1,169 @@
+from typing import Any, Dict, Iterable, List, Tuple, Union, TYPE_CHECKING
+
+from msgspec import inspect
+from typing_extensions import get_type_hints
+
+from .errors import NotDeclaredField
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+if TYPE_CHECKING:
+    from .typing import DocumentType
+
+__all__ = ("ColumnBuilder", "DictionaryColumn", "column_kinds")
+
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+DATETIME = "datetime"
+STR = "str"
+OBJECT = "object"
+
+_KINDS_BY_TYPE = {
+    inspect.IntType: INT,
+    inspect.FloatType: FLOAT,
+    inspect.BoolType: BOOL,
+    inspect.DateTimeType: DATETIME,
+    inspect.StrType: STR,
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "numpy is required for columnar export, "
+            "install it: pip install chouodm[columns]"
+        )
+    return np
+
+
+class DictionaryColumn(object):
+    """dictionary encoded string column: codes index categories, -1 is None"""
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: Any, categories: Any):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self) -> Any:
+        """returns object array with original values"""
+        numpy = _require_numpy()
+        values = numpy.empty(len(self.codes), dtype=object)
+        mask = self.codes >= 0
+        values[mask] = self.categories[self.codes[mask]]
+        return values
+
+
+def _kind(inspected: Any) -> Tuple[str, bool]:
+    """returns (column kind, nullable) for inspected annotation"""
+    if isinstance(inspected, inspect.UnionType):
+        types = [t for t in inspected.types if not isinstance(t, inspect.NoneType)]
+        nullable = len(types) != len(inspected.types)
+        if len(types) == 1:
+            return _KINDS_BY_TYPE.get(type(types[0]), OBJECT), nullable
+        return OBJECT, nullable
+    return _KINDS_BY_TYPE.get(type(inspected), OBJECT), False
+
+
+def column_kinds(
+    document_class: "DocumentType", fields: Iterable[str]
+) -> Dict[str, Tuple[str, bool]]:
+    """column kinds for fields from Document annotations"""
+    hints = get_type_hints(document_class, include_extras=True)
+    kinds = {}
+    for field in fields:
+        if field not in document_class.__struct_fields__:
+            raise NotDeclaredField(field, list(document_class.__struct_fields__))
+        if field == "_id":
+            kinds[field] = (OBJECT, True)
+            continue
+        kinds[field] = _kind(inspect.type_info(hints[field]))
+    return kinds
+
+
+class ColumnBuilder(object):
+    """accumulates field values row by row and builds typed numpy arrays
+
+    int -> int64 (float64 with nan if None or stored double found, object if
+    other values found), float -> float64,
+    bool -> bool (object if None found), datetime -> datetime64[ms],
+    str -> object array or DictionaryColumn, everything else -> object array.
+    """
+
+    __slots__ = ("kinds", "dictionary_encode", "_values", "_dictionaries")
+
+    def __init__(
+        self,
+        document_class: "DocumentType",
+        fields: Union[List[str], Tuple[str, ...]],
+        dictionary_encode: bool = False,
+    ):
+        _require_numpy()
+        self.kinds = column_kinds(document_class, fields)
+        self.dictionary_encode = dictionary_encode
+        self._values: Dict[str, list] = {field: [] for field in fields}
+        self._dictionaries: Dict[str, dict] = {
+            field: {}
+            for field, (kind, _) in self.kinds.items()
+            if kind == STR and dictionary_encode
+        }
+
+    def append(self, getter: Any) -> None:
+        """add one row, getter(field) returns field value"""
+        for field, values in self._values.items():
+            value = getter(field)
+            dictionary = self._dictionaries.get(field)
+            if dictionary is not None:
+                if value is None:
+                    values.append(-1)
+                    continue
+                code = dictionary.get(value)
+                if code is None:
+                    code = dictionary[value] = len(dictionary)
+                values.append(code)
+            else:
+                values.append(value)
+
+    def _build(self, field: str, values: list) -> Any:
+        kind, _ = self.kinds[field]
+        if field in self._dictionaries:
+            categories = np.empty(len(self._dictionaries[field]), dtype=object)
+            categories[:] = list(self._dictionaries[field])
+            return DictionaryColumn(np.array(values, dtype=np.int32), categories)
+        has_none = any(v is None for v in values)
+        if kind == INT:
+            numbers = [v for v in values if v is not None]
+            if all(type(v) is int for v in numbers):
+                if not has_none:
+                    return np.array(values, dtype=np.int64)
+                kind = FLOAT
+            elif all(isinstance(v, (int, float)) for v in numbers):
+                # stored doubles are not truncated to int64
+                kind = FLOAT
+        if kind == FLOAT:
+            return np.array(
+                [np.nan if v is None else v for v in values] if has_none else values,
+                dtype=np.float64,
+            )
+        if kind == BOOL and not has_none:
+            return np.array(values, dtype=np.bool_)
+        if kind == DATETIME:
+            return np.array(
+                [np.datetime64("NaT") if v is None else v for v in values],
+                dtype="datetime64[ms]",
+            )
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+    def build(self) -> Dict[str, Any]:
+        return {
+            field: self._build(field, values) for field, values in self._values.items()
+        }
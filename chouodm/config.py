@@ -2,9 +2,17 @@ from typing import Optional, List, Union, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pymongo import IndexModel
+    from pymongo.collation import Collation
 
 
 class BaseConfig(object):
     indexes: Optional[List['IndexModel']] = []
     database_exclude_fields: Optional[Union[List, Tuple]] = tuple()
     colletion_name: Optional[str] = None
+    collation: Optional['Collation'] = None
+    # opt-in coalescing of insert_one/update_one calls, 0 - disabled
+    write_batch_size: int = 0
+    # seconds to wait for more operations before batch is sent
+    write_batch_delay: float = 0.002
+    # keep loaded raw document, save() then updates only changed fields
+    track_changes: bool = False
@@ -7,26 +7,36 @@ from bson.raw_bson import RawBSONDocument
 from bson import decode as bson_decode, DBRef
 
 from pymongo import IndexModel
+from pymongo.collation import Collation
 
 from .manager import ODMManager, DynamicCollectionODMManager
 from .property import classproperty
-from .hooks import enc_hook, dec_hook
+from .codec import DocumentCodec, get_codec
 from .errors import QueryValidationError
 from .config import BaseConfig
 from .types import ObjectIdType
 from .relation import take_relation_info, Relation, RelationInfoTypes
+from .validation import compile_field_validators
+from .tracking import track, changed_values, mark_saved
 
 if TYPE_CHECKING:
     from .sync import SyncQueryBuilder
     from .query.builder import Builder
 
 
-class Document(Struct, kw_only=True, forbid_unknown_fields=True):  # type: ignore
+class Document(  # type: ignore
+    Struct, kw_only=True, forbid_unknown_fields=True, weakref=True
+):
     __indexes__: ClassVar[Set] = set()
     __database_exclude_fields__: ClassVar[Union[list, tuple]] = tuple()
     __collection_name__: ClassVar[Optional[str]] = None
     __relation_info__: ClassVar[dict] = {}
     __manager__: ClassVar[ODMManager]
+    __codec__: ClassVar[DocumentCodec]
+    __validators__: ClassVar[dict] = {}
+    __collation__: ClassVar[Optional[Collation]] = None
+    __write_batch__: ClassVar[Optional[Tuple[int, float]]] = None
+    __track_changes__: ClassVar[bool] = False
     has_relations: ClassVar[bool] = False
     _id: Optional[ObjectIdType] = None
 
@@ -36,6 +46,7 @@ class Document(Struct, kw_only=True, forbid_unknown_fields=True):  # type: ignor
     def __init_subclass__(cls, *args, **kwargs):
         super().__init_subclass__(*args, **kwargs)
         cls._init_subclass(*args, **kwargs)
+        cls.init_codec()
         cls.init_manager()
 
     def validate(self):
@@ -61,26 +72,56 @@ class Document(Struct, kw_only=True, forbid_unknown_fields=True):  # type: ignor
         indexes = getattr(cls.Config, "indexes", [])
         if not all([isinstance(index, IndexModel) for index in indexes]):
             raise ValueError("indexes must be list of IndexModel instances")
+        collation = getattr(cls.Config, "collation", None)
+        if collation is not None and not isinstance(collation, Collation):
+            raise ValueError("collation must be Collation instance")
+        write_batch = cls._get_write_batch_config()
+        track_changes = bool(getattr(cls.Config, "track_changes", False))
         exclude_fields = getattr(cls.Config, "database_exclude_fields", tuple())  # type: ignore
         collection_name = getattr(cls.Config, "collection_name", None) or None
         setattr(cls, "__indexes__", indexes)
+        setattr(cls, "__collation__", collation)
+        setattr(cls, "__write_batch__", write_batch)
+        setattr(cls, "__track_changes__", track_changes)
         setattr(cls, "__database_exclude_fields__", exclude_fields)
         setattr(cls, "__collection_name__", collection_name)
         setattr(cls, "__relation_info__", relation_infos)
         if relation_infos:
             setattr(cls, "has_relations", True)
+        setattr(cls, "__validators__", compile_field_validators(cls))
+
+    @classmethod
+    def _get_write_batch_config(cls) -> Optional[Tuple[int, float]]:
+        """(max batch size, max delay) from Config or None if batching is off"""
+        size = getattr(cls.Config, "write_batch_size", 0) or 0
+        delay = getattr(cls.Config, "write_batch_delay", 0.002)
+        if not isinstance(size, int) or size < 0:
+            raise ValueError("write_batch_size must be positive int or 0")
+        if not isinstance(delay, (int, float)) or delay < 0:
+            raise ValueError("write_batch_delay must be positive number of seconds")
+        if size <= 1:
+            return None
+        return size, float(delay)
 
     @classmethod
     def init_manager(cls):
         setattr(cls, "__manager__", ODMManager(cls))  # type: ignore
 
+    @classmethod
+    def init_codec(cls):
+        setattr(cls, "__codec__", DocumentCodec(cls))
+
     @classproperty
     def __encoder__(cls) -> json.Encoder:
-        return json.Encoder(enc_hook=enc_hook)
+        return get_codec(cls).encoder
 
     @classproperty
     def __decoder__(cls) -> json.Decoder:
-        return json.Decoder(cls, dec_hook=dec_hook)
+        return get_codec(cls).decoder
+
+    @classproperty
+    def __list_decoder__(cls) -> json.Decoder:
+        return get_codec(cls).list_decoder
 
     @classproperty
     def manager(cls):
@@ -123,6 +164,10 @@ class Document(Struct, kw_only=True, forbid_unknown_fields=True):  # type: ignor
     def from_json(cls, json_data: Union[str, bytes]) -> "Document":
         return cls.__decoder__.decode(json_data)
 
+    @classmethod
+    def from_json_list(cls, json_data: Union[str, bytes]) -> List["Document"]:
+        return cls.__list_decoder__.decode(json_data)
+
     @classmethod
     def from_dict(cls, data: dict) -> "Document":
         if cls.has_relations:
@@ -143,25 +188,16 @@ class Document(Struct, kw_only=True, forbid_unknown_fields=True):  # type: ignor
                 else:
                     db_rel = rel_data.to_relation(rel_data._id)
                 data[field_name] = db_rel
-        json_data = cls.__encoder__.encode(data)
-        return cls.from_json(json_data)
+        return get_codec(cls).convert(data)
 
     @classmethod
     def from_bson(cls, bson_raw_data: RawBSONDocument) -> "Document":
         data = bson_decode(bson_raw_data.raw)
-        if cls.has_relations:
-            for field, info in cls.__relation_info__.items():
-                row_data = data[field]
-                if row_data:
-                    rel = (
-                        [Relation.validate(r, info.document_class) for r in row_data]
-                        if isinstance(row_data, list)
-                        else Relation.validate(row_data, info.document_class)
-                    )
-                    data[field] = rel
-                else:
-                    data[field] = None
-        return cls(**data)
+        document = get_codec(cls).hydration_plan.hydrate(data)
+        if cls.__track_changes__:
+            # loaded state for save of changed fields only
+            track(document, bson_raw_data.raw)
+        return document
 
     @classmethod
     def New(cls, **kwargs):
@@ -181,6 +217,7 @@ class Document(Struct, kw_only=True, forbid_unknown_fields=True):  # type: ignor
                 "__values__",
                 "__decoder__",
                 "__encoder__",
+                "__list_decoder__",
                 "manager",
                 "data",
                 "pk",
@@ -241,28 +278,41 @@ class Document(Struct, kw_only=True, forbid_unknown_fields=True):  # type: ignor
         db_ref = cls.to_db_ref(object_id=object_id)
         return Relation(db_ref, cls)
 
+    async def _save_changes(
+        self,
+        builder: "Builder",
+        updated_fields: Union[Tuple, List],
+        session: Optional[AgnosticClientSession],
+    ) -> None:
+        """update saved document, without updated_fields only changed fields are
+        written if document was loaded with Config.track_changes"""
+        object_id = self._id if isinstance(self._id, ObjectId) else ObjectId(self._id)
+        changed = None
+        if updated_fields:
+            if not all(field in self.__struct_fields__ for field in updated_fields):
+                raise QueryValidationError("invalid field in updated_fields")
+        else:
+            changed = changed_values(
+                self, self.__struct_fields__, builder._validate_update_values
+            )
+            updated_fields = self.__struct_fields__ if changed is None else changed
+            if not updated_fields:
+                return
+        await builder.update_one(
+            filter={"_id": object_id},
+            set={field: getattr(self, field) for field in updated_fields},
+            session=session,
+        )
+        if changed:
+            mark_saved(self, changed)
+
     async def save(
         self,
         updated_fields: Union[Tuple, List] = [],
         session: Optional[AgnosticClientSession] = None,
     ) -> "Document":
         if self._id is not None:
-            data = {
-                "_id": (
-                    self._id if isinstance(self._id, ObjectId) else ObjectId(self._id)
-                )
-            }
-            if updated_fields:
-                if not all(field in self.__struct_fields__ for field in updated_fields):
-                    raise QueryValidationError("invalid field in updated_fields")
-            else:
-                updated_fields = self.__struct_fields__
-            for field in updated_fields:
-                data[f"{field}__set"] = getattr(self, field)
-            await self.Q().update_one(
-                session=session,
-                **data,
-            )
+            await self._save_changes(self.Q(), updated_fields, session)
             return self
         data = self.to_dict(with_props=False)
         object_id = await self.Q().insert_one(
@@ -307,13 +357,22 @@ class DynamicCollectionDocument(Document):
         indexes = getattr(cls.Config, "indexes", [])
         if not all([isinstance(index, IndexModel) for index in indexes]):
             raise ValueError("indexes must be list of IndexModel instances")
+        collation = getattr(cls.Config, "collation", None)
+        if collation is not None and not isinstance(collation, Collation):
+            raise ValueError("collation must be Collation instance")
+        write_batch = cls._get_write_batch_config()
+        track_changes = bool(getattr(cls.Config, "track_changes", False))
         exclude_fields = getattr(cls.Config, "database_exclude_fields", tuple())  # type: ignore
         collection_name = getattr(cls.Config, "collection_name", None) or None
         setattr(cls, "__indexes__", indexes)
+        setattr(cls, "__collation__", collation)
+        setattr(cls, "__write_batch__", write_batch)
+        setattr(cls, "__track_changes__", track_changes)
         setattr(cls, "__database_exclude_fields__", exclude_fields)
         setattr(cls, "__collection_name__", collection_name)
         setattr(cls, "__relation_info__", relation_infos)
         setattr(cls, "has_relations", False)
+        setattr(cls, "__validators__", compile_field_validators(cls))
 
     @classmethod
     def Q(cls, collection_name: str) -> "QueryBuilder":  # type: ignore
@@ -330,22 +389,7 @@ class DynamicCollectionDocument(Document):
         session: Optional[AgnosticClientSession] = None,
     ) -> "Document":
         if self._id is not None:
-            data = {
-                "_id": (
-                    self._id if isinstance(self._id, ObjectId) else ObjectId(self._id)
-                )
-            }
-            if updated_fields:
-                if not all(field in self.__struct_fields__ for field in updated_fields):
-                    raise QueryValidationError("invalid field in updated_fields")
-            else:
-                updated_fields = self.__struct_fields__
-            for field in updated_fields:
-                data[f"{field}__set"] = getattr(self, field)
-            await self.Q(collection_name).update_one(
-                session=session,
-                **data,
-            )
+            await self._save_changes(self.Q(collection_name), updated_fields, session)
             return self
         data = self.to_dict(with_props=False)
         object_id = await self.Q(collection_name).insert_one(
@@ -45,8 +45,10 @@ def db_ref_converter(db_ref: DBRef) -> dict:
     return {"id": db_ref.id, "collection": db_ref.collection}
 
 
-def decode_to_relation(db_ref_dict: dict, type: Any) -> Relation:
-    db_ref = DBRef(**db_ref_dict)
+def decode_to_relation(value: Union[dict, DBRef, Relation], type: Any) -> Relation:
+    if isinstance(value, Relation):
+        return value
+    db_ref = value if isinstance(value, DBRef) else DBRef(**value)
     return Relation(db_ref, type.__args__[0])
 
 
@@ -27,3 +27,30 @@ class ODMIndexError(BaseChouODMError):
 
 class DocumentDoesNotExist(BaseChouODMError):
     pass
+
+
+class InsertChunkError(object):
+    """failed part of insert_many: chunk of documents or one invalid document"""
+
+    __slots__ = ("offset", "size", "error")
+
+    def __init__(self, offset: int, size: int, error: Exception):
+        self.offset = offset
+        self.size = size
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"InsertChunkError(offset={self.offset}, size={self.size}, "
+            f"error={self.error!r})"
+        )
+
+
+class InsertManyError(BaseChouODMError):
+    def __init__(self, inserted_count: int, errors: list, *args):
+        self.inserted_count = inserted_count
+        self.errors = errors
+        super().__init__(*args)
+
+    def __str__(self):
+        return f"{len(self.errors)} insert errors, inserted - {self.inserted_count}"
@@ -0,0 +1,79 @@
+from typing import Any, Optional, TYPE_CHECKING
+
+from bson import DBRef, decode as bson_decode
+from bson.raw_bson import RawBSONDocument
+
+from .codec import get_codec
+
+if TYPE_CHECKING:
+    from .document import Document
+    from .typing import DocumentType
+
+__all__ = ("LazyDocument", "inflate_raw")
+
+
+def inflate_raw(value: Any) -> Any:
+    """convert nested RawBSONDocument values to python objects"""
+    if isinstance(value, RawBSONDocument):
+        data = bson_decode(value.raw)
+        if "$ref" in data and "$id" in data:
+            return DBRef(data.pop("$ref"), data.pop("$id"), data.pop("$db", None), **data)
+        return data
+    if isinstance(value, list):
+        return [inflate_raw(v) for v in value]
+    return value
+
+
+class LazyDocument(object):
+    """read only proxy over RawBSONDocument returned by cursor
+
+    Document fields are decoded on first access and cached, everything else
+    (properties, methods, data) is delegated to the materialized Document.
+    """
+
+    __slots__ = ("_raw", "_document_class", "_cache", "_document")
+
+    def __init__(self, document_class: "DocumentType", raw: RawBSONDocument):
+        self._raw = raw
+        self._document_class = document_class
+        self._cache: dict = {}
+        self._document: Optional["Document"] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._document is not None:
+            return getattr(self._document, name)
+        if name not in self._document_class.__struct_fields__:
+            return getattr(self.materialize(), name)
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        try:
+            value = inflate_raw(self._raw[name])
+        except KeyError:
+            # default value of missing field is known only to the Struct
+            return getattr(self.materialize(), name)
+        converter = get_codec(self._document_class).hydration_plan.field_converters.get(
+            name
+        )
+        if converter is not None:
+            value = converter(value)
+        cache[name] = value
+        return value
+
+    def __repr__(self) -> str:
+        return f"Lazy{self._document_class.__name__}(_id={self._id!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyDocument):
+            other = other.materialize()
+        return self.materialize() == other
+
+    @property
+    def raw(self) -> RawBSONDocument:
+        return self._raw
+
+    def materialize(self) -> "Document":
+        """decode whole document, result is cached"""
+        if self._document is None:
+            self._document = self._document_class.from_bson(self._raw)
+        return self._document
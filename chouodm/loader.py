@@ -0,0 +1,151 @@
+import asyncio
+from contextvars import ContextVar, Token
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from bson.errors import BSONError
+
+from .errors import QueryValidationError
+from .validation import get_field_validator
+
+if TYPE_CHECKING:
+    from .document import Document
+    from .query.builder import Builder
+
+__all__ = ("DocumentLoader", "get_document_loader")
+
+_document_loader: ContextVar[Optional["DocumentLoader"]] = ContextVar(
+    "chouodm_document_loader", default=None
+)
+
+
+def get_document_loader() -> Optional["DocumentLoader"]:
+    """loader of current context, None outside of DocumentLoader scope"""
+    return _document_loader.get()
+
+
+class DocumentLoader(object):
+    """batches get by _id calls made in one event loop tick
+
+    Relation.get and Builder.get_by_id calls made inside the scope are
+    collected until the loop runs scheduled callbacks and then loaded with
+    one _id $in query per collection. Loaded documents are cached for the
+    scope, so use one loader per request.
+
+    Usage:
+        async with DocumentLoader():
+            authors = await asyncio.gather(*(b.author.get() for b in books))
+    """
+
+    __slots__ = ("queries", "_cache", "_pending", "_token", "_tasks")
+
+    def __init__(self):
+        # $in queries made, for tests and debugging
+        self.queries = 0
+        # (collection, with relations, str(_id)) -> future with document or None
+        self._cache: Dict[Tuple[str, bool, str], asyncio.Future] = {}
+        # (builder, with relations) -> [(_id, future)] waiting for dispatch
+        self._pending: Dict[Tuple["Builder", bool], List[Tuple[Any, Any]]] = {}
+        self._token: Optional[Token] = None
+        self._tasks: set = set()
+
+    async def __aenter__(self) -> "DocumentLoader":
+        self._token = _document_loader.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, *args, **kwargs) -> None:
+        if self._token is not None:
+            _document_loader.reset(self._token)
+            self._token = None
+        # loads requested in the scope dont outlive it
+        self._dispatch()
+        tasks = list(self._tasks)
+        if exc_type is not None:
+            for task in tasks:
+                task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def clear(self) -> None:
+        """forget loaded documents, next calls query database again"""
+        self._cache.clear()
+
+    def load(
+        self, builder: "Builder", object_id: Any, with_relations_objects: bool = False
+    ) -> asyncio.Future:
+        """future with document by _id or None if it does not exist
+
+        Future is shared by all callers of the scope, await it with
+        asyncio.shield so cancelled caller does not cancel it for others.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            # invalid _id fails only its caller, not the whole batch
+            object_id = get_field_validator(builder.odm_manager.document, "_id")(
+                object_id
+            )
+        except (BSONError, QueryValidationError, TypeError, ValueError) as e:
+            future = loop.create_future()
+            future.set_exception(e)
+            return future
+        key = (builder._collection.full_name, with_relations_objects, str(object_id))
+        future = self._cache.get(key)
+        if future is not None:
+            if not future.done() or (
+                not future.cancelled() and future.exception() is None
+            ):
+                return future
+            # failed or cancelled load is retried
+            del self._cache[key]
+        future = self._cache[key] = loop.create_future()
+        if not self._pending:
+            # runs after callbacks already scheduled, e.g. other gathered tasks
+            loop.call_soon(self._dispatch)
+        self._pending.setdefault((builder, with_relations_objects), []).append(
+            (object_id, future)
+        )
+        return future
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        for (builder, with_relations_objects), batch in pending.items():
+            task = asyncio.ensure_future(
+                self._fetch(builder, with_relations_objects, batch)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(partial(self._cancel_batch, batch))
+
+    @staticmethod
+    def _cancel_batch(batch: List[Tuple[Any, asyncio.Future]], task: Any) -> None:
+        # fetch cancelled on scope exit, also before it started
+        if task.cancelled():
+            for _, future in batch:
+                future.cancel()
+
+    async def _fetch(
+        self,
+        builder: "Builder",
+        with_relations_objects: bool,
+        batch: List[Tuple[Any, asyncio.Future]],
+    ) -> None:
+        self.queries += 1
+        try:
+            ids = list({str(object_id): object_id for object_id, _ in batch}.values())
+            result = await builder.find(
+                _id__in=ids, with_relations_objects=with_relations_objects
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            # failed loads are not cached
+            collection_name = builder._collection.full_name
+            for object_id, _ in batch:
+                key = (collection_name, with_relations_objects, str(object_id))
+                self._cache.pop(key, None)
+            return
+        documents: Dict[str, "Document"] = {str(d._id): d for d in result}
+        for object_id, future in batch:
+            if not future.done():
+                future.set_result(documents.get(str(object_id)))
@@ -0,0 +1,194 @@
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from bson import decode as bson_decode, encode as bson_encode
+from bson.raw_bson import RawBSONDocument
+
+from .codec import get_codec
+from .relation import PrefetchTree, RelationInfo, RelationInfoTypes, parse_prefetch
+from .tracking import track
+from .types import Relation
+
+if TYPE_CHECKING:
+    from .document import Document
+    from .typing import DocumentType
+
+__all__ = (
+    "RELATION_STRATEGY_IN",
+    "RELATION_STRATEGY_LOOKUP",
+    "RELATION_STRATEGIES",
+    "LookupPlan",
+    "get_lookup_plan",
+)
+
+# relation objects are fetched with one find(_id__in=...) per class and level
+RELATION_STRATEGY_IN = "in"
+# relation objects are joined by server with $lookup in one aggregation
+RELATION_STRATEGY_LOOKUP = "lookup"
+RELATION_STRATEGIES = (RELATION_STRATEGY_IN, RELATION_STRATEGY_LOOKUP)
+
+# looked up documents are kept in temporary field until hydration
+LOOKUP_FIELD_PREFIX = "__lookup_"
+
+
+def _relation_ids(field: str, array: bool) -> dict:
+    # relations are stored as DBRef ($id) or as {"id": ..., "collection": ...}
+    if array:
+        return {
+            "$concatArrays": [
+                {"$ifNull": [f"${field}.$id", []]},
+                {"$ifNull": [f"${field}.id", []]},
+            ]
+        }
+    return {"$ifNull": [f"${field}.$id", f"${field}.id"]}
+
+
+def _match_ids(array: bool) -> dict:
+    # $$ids is bound by let of $lookup to ids from _relation_ids
+    if array:
+        return {"$in": ["$_id", {"$ifNull": ["$$ids", []]}]}
+    return {"$eq": ["$_id", "$$ids"]}
+
+
+class LookupPlan(object):
+    """relation fields of Document compiled to $lookup aggregation stages
+
+    Single relations are unwound, arrays are matched back to relation order
+    on hydration. Nested relations are looked up in sub-pipelines.
+    """
+
+    __slots__ = ("document_class", "stages", "fields")
+
+    def __init__(
+        self,
+        document_class: "DocumentType",
+        stages: List[dict],
+        fields: Tuple[Tuple[str, RelationInfo, "LookupPlan"], ...],
+    ):
+        self.document_class = document_class
+        self.stages = stages
+        self.fields = fields
+
+    @classmethod
+    def compile(
+        cls,
+        document_class: "DocumentType",
+        tree: Optional[PrefetchTree] = None,
+        max_depth: Optional[int] = None,
+        path: Tuple["DocumentType", ...] = (),
+    ) -> "LookupPlan":
+        stages: List[dict] = []
+        fields = []
+        if max_depth is not None and max_depth <= 0:
+            return cls(document_class, stages, ())
+        path = path + (document_class,)
+        for field, relation_info in document_class.__relation_info__.items():
+            if tree is not None and field not in tree:
+                continue
+            target = relation_info.document_class
+            # without limits reference cycles stay Relation handles
+            if tree is None and max_depth is None and target in path:
+                continue
+            child = cls.compile(
+                target,
+                None if tree is None else tree[field],
+                None if max_depth is None else max_depth - 1,
+                path,
+            )
+            array = relation_info.relation_type == RelationInfoTypes.ARRAY
+            lookup_field = f"{LOOKUP_FIELD_PREFIX}{field}"
+            lookup: Dict[str, Any] = {"from": target.get_collection_name()}
+            if child.stages:
+                # localField with pipeline needs MongoDB 5.0, let/$expr works on 3.6
+                lookup["let"] = {"ids": f"${lookup_field}"}
+                lookup["pipeline"] = [
+                    {"$match": {"$expr": _match_ids(array)}},
+                    *child.stages,
+                ]
+            else:
+                lookup["localField"] = lookup_field
+                lookup["foreignField"] = "_id"
+            lookup["as"] = lookup_field
+            stages.append({"$addFields": {lookup_field: _relation_ids(field, array)}})
+            stages.append({"$lookup": lookup})
+            if not array:
+                stages.append(
+                    {
+                        "$unwind": {
+                            "path": f"${lookup_field}",
+                            "preserveNullAndEmptyArrays": True,
+                        }
+                    }
+                )
+            fields.append((field, relation_info, child))
+        return cls(document_class, stages, tuple(fields))
+
+    def hydrate(
+        self, data: dict, identity_map: Dict[Tuple["LookupPlan", str], Any]
+    ) -> Any:
+        """Document from decoded row, relation fields are set to looked up objects
+
+        identity_map is shared by all rows of one query, same related document
+        is hydrated once per plan, so document reached by shallower path does
+        not hide relations of deeper one.
+        """
+        looked_up = {
+            field: data.pop(f"{LOOKUP_FIELD_PREFIX}{field}", None)
+            for field, _, _ in self.fields
+        }
+        # snapshot is taken without lookup fields, as document is stored
+        raw = bson_encode(data) if self.document_class.__track_changes__ else None
+        document = get_codec(self.document_class).hydration_plan.hydrate(data)
+        if raw is not None:
+            track(document, raw)
+        for field, relation_info, child in self.fields:
+            relation_attr = getattr(document, field, None)
+            if not relation_attr:
+                continue
+            rows = looked_up[field] or []
+            if isinstance(rows, dict):
+                rows = [rows]
+            related = {}
+            for row in rows:
+                key = (child, str(row["_id"]))
+                obj = identity_map.get(key)
+                if obj is None:
+                    obj = identity_map[key] = child.hydrate(row, identity_map)
+                related[key[1]] = obj
+            if relation_info.relation_type == RelationInfoTypes.ARRAY:
+                value: Any = []
+                for relation in relation_attr:
+                    if not isinstance(relation, Relation):
+                        value.append(relation)
+                        continue
+                    obj = related.get(str(relation.db_ref.id))
+                    if obj is not None:
+                        value.append(obj)
+            else:
+                value = related.get(str(relation_attr.db_ref.id))
+            setattr(document, field, value)
+        return document
+
+    def from_bson(
+        self,
+        row: RawBSONDocument,
+        identity_map: Dict[Tuple["LookupPlan", str], Any],
+    ) -> "Document":
+        return self.hydrate(bson_decode(row.raw), identity_map)
+
+
+def get_lookup_plan(
+    document_class: "DocumentType",
+    prefetch: Optional[Tuple[str, ...]] = None,
+    max_depth: Optional[int] = None,
+) -> LookupPlan:
+    """returns cached LookupPlan for prefetch paths and max_depth"""
+    if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 0):
+        raise ValueError("max_depth must be positive int or 0")
+    lookup_plans = get_codec(document_class).lookup_plans
+    key = (prefetch, max_depth)
+    plan = lookup_plans.get(key)
+    if plan is None:
+        tree = parse_prefetch(document_class, prefetch) if prefetch else None
+        plan = LookupPlan.compile(document_class, tree, max_depth)
+        lookup_plans[key] = plan
+    return plan
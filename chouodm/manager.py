@@ -1,16 +1,23 @@
-from typing import Optional, TYPE_CHECKING, List
+from typing import Optional, TYPE_CHECKING, List, Tuple
 import asyncio
+import os
 
 from motor.core import AgnosticClientSession, AgnosticCollection, AgnosticDatabase
 from pymongo.errors import AutoReconnect, ServerSelectionTimeoutError, NetworkTimeout
 
 
-from .query import ExtraQueryMapper
+from .query import ExtraQueryMapper, QueryPlan
 from .query.builder import Builder
 from .errors import NotDeclaredField
 from .relation import RelationManager
 from .sync import SyncQueryBuilder
 from .aggregate.aggregate import Aggregate
+from .utils import LRUCache
+
+# compiled query plans kept per document, keyed by query kwargs names
+QUERY_PLAN_CACHE_SIZE = 256
+# builders kept per document, keyed by collection name and running event loop
+BUILDER_CACHE_SIZE = 128
 
 if TYPE_CHECKING:
     from .document import Document
@@ -22,6 +29,7 @@ class ODMManager(object):
     __collection__: Optional[AgnosticCollection] = None
     __connection__: Optional["Connection"] = None
     __relation_manager__: Optional[RelationManager] = None
+    __pid__: Optional[int] = None
 
     def __init__(self, document: "Document"):
 
@@ -30,13 +38,21 @@ class ODMManager(object):
             self.__relation_manager__ = RelationManager(self.__document__)
         else:
             self.__relation_manager__ = None
+        self._query_plans = LRUCache(QUERY_PLAN_CACHE_SIZE)
+        # (Builder, SyncQueryBuilder) by (collection name, running loop),
+        # valid for _builders_database
+        self._builders = LRUCache(BUILDER_CACHE_SIZE)
+        self._builders_database: Optional[AgnosticDatabase] = None
 
     @property
     def database(self) -> AgnosticDatabase:
         """Returns the database that is currently associated with this document."""
         if not hasattr(self, "__database__") or self.__database__ is None:
             raise AttributeError("Accessing database without using it first.")
-        return self.__database__
+        if self.__pid__ != os.getpid():
+            # forked process must not use motor client of parent process
+            ODMManager.use(self.connection)
+        return self.__database__  # type: ignore
 
     @property
     def connection(self) -> "Connection":
@@ -86,14 +102,36 @@ class ODMManager(object):
         cls.__database__ = connection._get_motor_client().get_database(
             connection.database_name
         )
+        cls.__pid__ = os.getpid()
+
+    def _get_builders(self, collection_name: str) -> Tuple[Builder, SyncQueryBuilder]:
+        """cached builders for collection
+
+        Builders are kept per running event loop, write batcher of builder
+        waits on loop it was first used in. Cache is dropped when database
+        changes: use() with other connection or first access after fork.
+        """
+        database = self.database
+        if self._builders_database is not database:
+            self._builders.clear()
+            self._builders_database = database
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        key = (collection_name, loop)
+        builders = self._builders.get(key)
+        if builders is None:
+            builder = Builder(self, collection_name)
+            builders = (builder, SyncQueryBuilder(builder))
+            self._builders.set(key, builders)
+        return builders
 
     def querybuilder(self) -> Builder:
-        builder = Builder(self, self.document.get_collection_name())
-        return builder
+        return self._get_builders(self.document.get_collection_name())[0]
 
     def sync_querybuilder(self) -> SyncQueryBuilder:
-        builder = Builder(self, self.document.get_collection_name())
-        return SyncQueryBuilder(builder)
+        return self._get_builders(self.document.get_collection_name())[1]
 
     @property
     def document(self) -> "Document":
@@ -121,6 +159,17 @@ class ODMManager(object):
                 field_param.append(param)
         return field_param, extra
 
+    def query_plan(
+        self, query_fields: Tuple[str, ...], with_validate_document_fields: bool = True
+    ) -> QueryPlan:
+        """returns cached compiled plan for query kwargs names"""
+        key = (query_fields, with_validate_document_fields)
+        plan = self._query_plans.get(key)
+        if plan is None:
+            plan = QueryPlan.compile(self, query_fields, with_validate_document_fields)
+            self._query_plans.set(key, plan)
+        return plan
+
     async def ensure_indexes(self):
         """method for create/update/delete indexes if indexes declared in Config property"""
 
@@ -150,12 +199,10 @@ class ODMManager(object):
 
 class DynamicCollectionODMManager(ODMManager):
     def querybuilder(self, collection_name: str) -> Builder:  # type: ignore
-        builder = Builder(self, collection_name)
-        return builder
+        return self._get_builders(collection_name)[0]
 
     def sync_querybuilder(self, collection_name: str) -> SyncQueryBuilder:  # type: ignore
-        builder = Builder(self, collection_name)
-        return SyncQueryBuilder(builder)
+        return self._get_builders(collection_name)[1]
 
     async def ensure_indexes(self, collection_name: str):  # type: ignore
         """method for create/update/delete indexes if indexes declared in Config property"""
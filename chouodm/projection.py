@@ -0,0 +1,138 @@
+from typing import ClassVar, Dict, Optional, Tuple, Type, Union, TYPE_CHECKING
+
+from bson import decode as bson_decode
+from bson.raw_bson import RawBSONDocument
+from msgspec import Struct, defstruct, field, structs
+from typing_extensions import get_type_hints
+
+from .codec import get_codec
+from .errors import NotDeclaredField, QueryValidationError
+
+if TYPE_CHECKING:
+    from .typing import DocumentType
+
+__all__ = (
+    "PartialDocument",
+    "get_partial_type",
+    "resolve_projection",
+    "generate_projection",
+)
+
+
+class PartialDocument(Struct, kw_only=True):
+    """base class for partial Struct types returned by projected queries"""
+
+    __document_class__: ClassVar[type]
+    __relation_info__: ClassVar[dict] = {}
+
+    @classmethod
+    def from_bson(cls, bson_raw_data: RawBSONDocument) -> "PartialDocument":
+        data = bson_decode(bson_raw_data.raw)
+        return get_codec(cls).hydration_plan.hydrate(data)  # type: ignore
+
+    def to_dict(self) -> dict:
+        data = structs.asdict(self)
+        for field_name in self.__relation_info__:
+            relation = data[field_name]
+            if relation and not isinstance(relation, dict):
+                data[field_name] = (
+                    relation.to_dict()
+                    if not isinstance(relation, list)
+                    else [
+                        a.to_dict() if not isinstance(a, dict) else a
+                        for a in relation
+                    ]
+                )
+        return data
+
+    @property
+    def data(self) -> dict:
+        return self.to_dict()
+
+    def serialize(self, fields: Union[tuple, list]) -> dict:
+        data = self.to_dict()
+        return {k: data[k] for k in fields}
+
+
+def resolve_projection(
+    document_class: "DocumentType",
+    only: Union[tuple, list, None] = None,
+    exclude: Union[tuple, list, None] = None,
+) -> Optional[Tuple[str, ...]]:
+    """validate only/exclude params
+
+    Returns:
+        Optional[Tuple[str, ...]]: selected fields in declaration order or None
+    """
+    if not only and not exclude:
+        return None
+    if only and exclude:
+        raise QueryValidationError("only and exclude cant be used together")
+    struct_fields = document_class.__struct_fields__
+    for field_name in only or exclude:  # type: ignore
+        if field_name not in struct_fields:
+            raise NotDeclaredField(field_name, list(struct_fields))
+    if only:
+        selected = set(only)
+        selected.add("_id")
+    else:
+        selected = set(struct_fields).difference(exclude)  # type: ignore
+    return tuple(f for f in struct_fields if f in selected)
+
+
+def generate_projection(fields: Tuple[str, ...]) -> dict:
+    projection = {f: True for f in fields}
+    if "_id" not in projection:
+        projection["_id"] = False
+    return projection
+
+
+def _generate_partial_type(
+    document_class: "DocumentType", fields: Tuple[str, ...]
+) -> Type[PartialDocument]:
+    hints = get_type_hints(document_class, include_extras=True)
+    struct_fields = document_class.__struct_fields__
+    defaults = document_class.__struct_defaults__
+    defaults_offset = len(struct_fields) - len(defaults)
+    partial_fields = []
+    for index, field_name in enumerate(struct_fields):
+        if field_name not in fields:
+            continue
+        if index < defaults_offset:
+            partial_fields.append((field_name, hints[field_name]))
+            continue
+        default = defaults[index - defaults_offset]
+        factory = getattr(default, "factory", None)
+        if factory is not None:
+            default = field(default_factory=factory)
+        partial_fields.append((field_name, hints[field_name], default))
+    relation_info = {
+        f: info
+        for f, info in document_class.__relation_info__.items()
+        if f in fields
+    }
+    return defstruct(
+        f"{document_class.__name__}Partial",
+        partial_fields,
+        bases=(PartialDocument,),
+        module=document_class.__module__,
+        namespace={
+            "__document_class__": document_class,
+            "__relation_info__": relation_info,
+        },
+        kw_only=True,
+    )
+
+
+def get_partial_type(
+    document_class: "DocumentType", fields: Tuple[str, ...]
+) -> Type[PartialDocument]:
+    """returns cached partial Struct type for fields of document_class"""
+    partial_types: Dict[Tuple[str, ...], Type[PartialDocument]] = get_codec(
+        document_class
+    ).partial_types
+    partial_type = partial_types.get(fields)
+    if partial_type is None:
+        partial_type = _generate_partial_type(document_class, fields)
+        partial_types[fields] = partial_type
+    return partial_type
@@ -1,5 +1,12 @@
+import asyncio
+import heapq
+from decimal import Decimal
+from itertools import chain
+from operator import itemgetter
 from typing import (
+    AsyncGenerator,
     AsyncIterable,
+    AsyncIterator,
     Union,
     List,
     Dict,
@@ -10,27 +17,90 @@ from typing import (
     Iterable,
 )
 
-from bson import ObjectId, decode as bson_decode
+from bson import Decimal128, ObjectId, decode as bson_decode, encode as bson_encode
+from bson.errors import InvalidDocument
 from bson.raw_bson import RawBSONDocument
+from msgspec import ValidationError
 from pymongo import ReturnDocument, IndexModel
+from pymongo.errors import BulkWriteError, PyMongoError
+from pymongo.results import BulkWriteResult
 from motor.core import AgnosticClientSession as ClientSession
 
 from .query import generate_basic_query, Q, QCombination
-from .result import FindResult, SimpleAggregateResult
-from .extra import group_by_aggregate_generation, generate_name_field
+from .result import FindResult, PageResult, RawFindResult, SimpleAggregateResult
+from .pagination import (
+    key_fields,
+    check_sort_paths,
+    encode_token,
+    decode_token,
+    seek_query,
+    row_key,
+    sort_key,
+)
+from .extra import (
+    group_by_aggregate_generation,
+    generate_name_field,
+    bulk_query_generator,
+    merge_bulk_results,
+    split_in_query,
+)
 
 from ..aggregate.expressions import Sum, Max, Min, Avg
 from ..errors import (
     InvalidArgsParams,
+    NotDeclaredField,
     QueryValidationError,
     ODMIndexError,
     DocumentDoesNotExist,
+    InsertChunkError,
+    InsertManyError,
 )
-from ..validation import sort_validation
+from ..validation import get_field_validator, sort_validation
+from ..utils import aenumerate, chunk_by_length
+from ..lazy import LazyDocument, inflate_raw
+from ..batcher import WriteBatcher
+from ..loader import get_document_loader
+from ..lookup import (
+    RELATION_STRATEGIES,
+    RELATION_STRATEGY_LOOKUP,
+    RELATION_STRATEGY_IN,
+    get_lookup_plan,
+)
+from ..columns import ColumnBuilder
+from ..projection import get_partial_type, resolve_projection, generate_projection
 
 
 __all__ = ("Builder",)
 
+# documents per relation query when iterate() loads relations without batch_size
+DEFAULT_RELATION_BATCH_SIZE = 100
+DEFAULT_PAGE_SIZE = 100
+# operations per bulk_write request and requests running at once
+DEFAULT_BULK_CHUNK_SIZE = 1000
+DEFAULT_BULK_CONCURRENCY = 4
+# chunk queries of split $in filter running at once
+DEFAULT_IN_CONCURRENCY = 4
+# rows read ahead from unsorted chunk cursors
+DEFAULT_IN_BUFFER_SIZE = 1000
+# $inc values, Int64 is int
+INC_TYPES = (int, float, Decimal, Decimal128)
+# insert_many request size, well below server max message size (48MB)
+DEFAULT_INSERT_CHUNK_BYTES = 8 * 1024 * 1024
+
+# collection methods which get Config.collation with filter
+COLLATION_METHODS = frozenset(
+    (
+        "count_documents",
+        "find_one",
+        "delete_one",
+        "delete_many",
+        "update_one",
+        "update_many",
+        "find_one_and_update",
+        "find_one_and_replace",
+    )
+)
+
 if TYPE_CHECKING:
     from ..manager import ODMManager
     from ..typing import DictStrAny
@@ -38,11 +108,20 @@ if TYPE_CHECKING:
 
 
 class Builder(object):
-    __slots__ = ("odm_manager", "_collection")
+    __slots__ = ("odm_manager", "_collection", "_write_batcher")
 
     def __init__(self, odm_manager: "ODMManager", query_collectcion_name: str):
         self.odm_manager: "ODMManager" = odm_manager
         self._collection = self.odm_manager.get_collection(query_collectcion_name)
+        write_batch = self.odm_manager.document.__write_batch__
+        self._write_batcher: Optional[WriteBatcher] = (
+            WriteBatcher(self._collection, *write_batch) if write_batch else None
+        )
+
+    @property
+    def write_batcher(self) -> Optional[WriteBatcher]:
+        """batcher of insert_one/update_one calls if Config.write_batch_size is set"""
+        return self._write_batcher
 
     def _validate_query_data(self, query: Dict) -> "DictStrAny":
         """main validation method
@@ -107,6 +186,9 @@ class Builder(object):
         query: tuple = (query_params,)
         if session:
             kwargs["session"] = session
+        collation = self.odm_manager.document.__collation__
+        if collation is not None and method_name in COLLATION_METHODS:
+            kwargs["collation"] = collation
         if set_values:
             query = (query_params, set_values)
         if kwargs:
@@ -165,7 +247,7 @@ class Builder(object):
     async def insert_one(
         self, session: Optional[ClientSession] = None, **query
     ) -> ObjectId:
-        """insert one document
+        """insert one document, batched if Config.write_batch_size is set
 
         Args:
             session (Optional[ClientSession], optional): motor session. Defaults to None.
@@ -174,6 +256,8 @@ class Builder(object):
             ObjectId: created document _id
         """
         obj = self.odm_manager.document.parse_obj(query)
+        if self._write_batcher is not None and session is None:
+            return await self._write_batcher.insert(obj._mongo_query_data)
         data = await self._make_query(
             "insert_one",
             obj._mongo_query_data,
@@ -182,28 +266,272 @@ class Builder(object):
         return data.inserted_id
 
     async def insert_many(
-        self, data: List, session: Optional[ClientSession] = None
+        self,
+        data: Union[Iterable, AsyncIterable],
+        session: Optional[ClientSession] = None,
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        chunk_bytes: int = DEFAULT_INSERT_CHUNK_BYTES,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
     ) -> int:
         """insert many documents
 
+        Data is consumed as stream: documents are validated and encoded one by
+        one and sent by unordered chunks, at most concurrency chunks at once.
+        Failed chunks and invalid documents dont stop the load, they are
+        reported after all chunks are sent. If data iterable raises, running
+        chunks are cancelled and error of size 0 is reported at offset where
+        load stopped.
+
         Args:
-            data (List): List of dict or MongoModels
+            data (Union[Iterable, AsyncIterable]): dicts or MongoModels, list, generator or async iterable
             session (Optional[ClientSession], optional): motor session. Defaults to None.
+            chunk_size (int, optional): max documents per request. Defaults to DEFAULT_BULK_CHUNK_SIZE.
+            chunk_bytes (int, optional): max encoded bytes per request. Defaults to DEFAULT_INSERT_CHUNK_BYTES.
+            concurrency (int, optional): max requests at once. Defaults to DEFAULT_BULK_CONCURRENCY.
+
+        Raises:
+            InsertManyError: with inserted_count and InsertChunkError list if something failed
 
         Returns:
-            int: count inserted ids
+            int: count inserted documents
         """
+        if chunk_size < 1 or concurrency < 1:
+            raise ValueError("chunk_size and concurrency must be greater than 0")
+        if session is not None:
+            # session cant be used by concurrent operations
+            concurrency = 1
         parse_obj = self.odm_manager.document.parse_obj
-        query = [
-            (
-                parse_obj(obj)._mongo_query_data
-                if isinstance(obj, dict)
-                else obj._mongo_query_data
-            )
-            for obj in data
-        ]
-        r = await self._make_query("insert_many", query, session=session)
-        return len(r.inserted_ids)
+        codec_options = self._collection.codec_options
+        insert_many = getattr(self._collection, "insert_many")
+        semaphore = asyncio.Semaphore(concurrency)
+        # running chunk task -> (offset, size)
+        tasks: Dict[asyncio.Future, Tuple[int, int]] = {}
+        errors: List[InsertChunkError] = []
+        inserted_count = 0
+
+        async def insert(offset: int, chunk: List[RawBSONDocument]) -> None:
+            nonlocal inserted_count
+            try:
+                await insert_many(chunk, ordered=False, session=session)
+                inserted_count += len(chunk)
+            except BulkWriteError as e:
+                inserted_count += e.details.get("nInserted", 0)
+                errors.append(InsertChunkError(offset, len(chunk), e))
+            except PyMongoError as e:
+                errors.append(InsertChunkError(offset, len(chunk), e))
+
+        def done(task: asyncio.Future) -> None:
+            # called for tasks cancelled before start too
+            tasks.pop(task, None)
+            semaphore.release()
+
+        async def send(offset: int, chunk: List[RawBSONDocument]) -> None:
+            # waits for free slot, so not sent chunks dont pile up in memory
+            await semaphore.acquire()
+            task = asyncio.ensure_future(insert(offset, chunk))
+            tasks[task] = (offset, len(chunk))
+            task.add_done_callback(done)
+
+        chunk: List[RawBSONDocument] = []
+        chunk_offset, chunk_size_bytes = 0, 0
+        index = -1
+        try:
+            async for index, obj in aenumerate(data):
+                try:
+                    document = (
+                        parse_obj(obj)._mongo_query_data
+                        if isinstance(obj, dict)
+                        else obj._mongo_query_data
+                    )
+                    document = {"_id": ObjectId(), **document}
+                    # encoded once here, pymongo sends raw documents as is
+                    raw = RawBSONDocument(
+                        bson_encode(document, codec_options=codec_options)
+                    )
+                except (
+                    ValidationError,
+                    InvalidDocument,
+                    ValueError,
+                    TypeError,
+                    AttributeError,
+                ) as e:
+                    errors.append(InsertChunkError(index, 1, e))
+                    continue
+                raw_size = len(raw.raw)
+                if chunk and (
+                    len(chunk) >= chunk_size
+                    or chunk_size_bytes + raw_size > chunk_bytes
+                ):
+                    await send(chunk_offset, chunk)
+                    chunk, chunk_size_bytes = [], 0
+                if not chunk:
+                    chunk_offset = index
+                chunk.append(raw)
+                chunk_size_bytes += raw_size
+            if chunk:
+                await send(chunk_offset, chunk)
+                chunk = []
+            if tasks:
+                await asyncio.gather(*tasks)
+        except BaseException as e:
+            # source failed or caller was cancelled, sent chunks are stopped
+            running = dict(tasks)
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            for task, (offset, size) in running.items():
+                if task.cancelled():
+                    errors.append(
+                        InsertChunkError(offset, size, asyncio.CancelledError())
+                    )
+            if not isinstance(e, Exception):
+                raise
+            if chunk:
+                errors.append(InsertChunkError(chunk_offset, len(chunk), e))
+            # load stopped after last read document
+            errors.append(InsertChunkError(index + 1, 0, e))
+            errors.sort(key=lambda error: error.offset)
+            raise InsertManyError(inserted_count, errors) from e
+        if errors:
+            errors.sort(key=lambda e: e.offset)
+            raise InsertManyError(inserted_count, errors)
+        return inserted_count
+
+    async def bulk_write(
+        self,
+        operations: List,
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        ordered: bool = False,
+        session: Optional[ClientSession] = None,
+    ) -> BulkWriteResult:
+        """pymongo bulk_write split to chunks, chunks are sent concurrently
+
+        Pymongo additionally splits every chunk by server message size limits.
+        Ordered writes and writes in session run chunk by chunk.
+
+        Args:
+            operations (List): pymongo write operations (UpdateOne, InsertOne...)
+            chunk_size (int, optional): operations per request. Defaults to DEFAULT_BULK_CHUNK_SIZE.
+            concurrency (int, optional): max requests at once. Defaults to DEFAULT_BULK_CONCURRENCY.
+            ordered (bool, optional): stop on first error. Defaults to False.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+
+        Raises:
+            BulkWriteError: with merged details of all chunks if any write failed
+
+        Returns:
+            BulkWriteResult: counts for all chunks
+        """
+        if chunk_size < 1 or concurrency < 1:
+            raise ValueError("chunk_size and concurrency must be greater than 0")
+        if ordered or session is not None:
+            # session cant be used by concurrent operations
+            concurrency = 1
+        bulk_write = getattr(self._collection, "bulk_write")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def write(chunk: List) -> Any:
+            async with semaphore:
+                try:
+                    return await bulk_write(chunk, ordered=ordered, session=session)
+                except BulkWriteError as e:
+                    return e
+
+        chunks = list(chunk_by_length(operations, chunk_size))
+        if ordered:
+            results = []
+            for chunk in chunks:
+                result = await write(chunk)
+                results.append(result)
+                if isinstance(result, BulkWriteError):
+                    break
+        else:
+            results = await asyncio.gather(*(write(chunk) for chunk in chunks))
+        if not all(isinstance(r, BulkWriteError) or r.acknowledged for r in results):
+            return BulkWriteResult({}, acknowledged=False)
+        merged = merge_bulk_results(
+            [
+                (
+                    i * chunk_size,
+                    r.details if isinstance(r, BulkWriteError) else r.bulk_api_result,
+                )
+                for i, r in enumerate(results)
+            ]
+        )
+        if merged["writeErrors"] or merged["writeConcernErrors"]:
+            raise BulkWriteError(merged)
+        return BulkWriteResult(merged, acknowledged=True)
+
+    async def bulk_update(
+        self,
+        documents: List["Document"],
+        updated_fields: Union[Tuple, List],
+        upsert: bool = False,
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        session: Optional[ClientSession] = None,
+    ) -> BulkWriteResult:
+        """update fields of saved documents by _id in bulk, see bulk_write
+
+        Args:
+            documents (List[Document]): documents with _id
+            updated_fields (Union[Tuple, List]): fields for $set
+            upsert (bool, optional): pymongo upsert. Defaults to False.
+            chunk_size (int, optional): operations per request. Defaults to DEFAULT_BULK_CHUNK_SIZE.
+            concurrency (int, optional): max requests at once. Defaults to DEFAULT_BULK_CONCURRENCY.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+
+        Returns:
+            BulkWriteResult: counts for all chunks
+        """
+        struct_fields = self.odm_manager.document.__struct_fields__
+        if not updated_fields or not all(f in struct_fields for f in updated_fields):
+            raise QueryValidationError("invalid field in updated_fields")
+        if any(document._id is None for document in documents):
+            raise QueryValidationError("documents for bulk_update must have _id")
+        operations = bulk_query_generator(
+            documents,
+            updated_fields=list(updated_fields),
+            upsert=upsert,
+            validate_data=self._validate_query_data,
+        )
+        return await self.bulk_write(
+            operations, chunk_size=chunk_size, concurrency=concurrency, session=session
+        )
+
+    async def bulk_upsert(
+        self,
+        documents: List["Document"],
+        query_fields: Union[Tuple, List],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        session: Optional[ClientSession] = None,
+    ) -> BulkWriteResult:
+        """upsert documents matched by query_fields values, see bulk_write
+
+        Args:
+            documents (List[Document]): documents
+            query_fields (Union[Tuple, List]): fields for filter, other fields are $set
+            chunk_size (int, optional): operations per request. Defaults to DEFAULT_BULK_CHUNK_SIZE.
+            concurrency (int, optional): max requests at once. Defaults to DEFAULT_BULK_CONCURRENCY.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+
+        Returns:
+            BulkWriteResult: counts for all chunks
+        """
+        struct_fields = self.odm_manager.document.__struct_fields__
+        if not query_fields or not all(f in struct_fields for f in query_fields):
+            raise QueryValidationError("invalid field in query_fields")
+        operations = bulk_query_generator(
+            documents,
+            query_fields=list(query_fields),
+            upsert=True,
+            validate_data=self._validate_query_data,
+        )
+        return await self.bulk_write(
+            operations, chunk_size=chunk_size, concurrency=concurrency, session=session
+        )
 
     async def delete_one(
         self,
@@ -265,8 +593,25 @@ class Builder(object):
         """
         query = self._validate_query_data(query)
         method = getattr(self._collection, "distinct")
+        collation = self.odm_manager.document.__collation__
+        if collation is not None:
+            return await method(
+                key=field, filter=query, session=session, collation=collation
+            )
         return await method(key=field, filter=query, session=session)
 
+    def _resolve_projection(
+        self,
+        only: Optional[Union[Tuple, List]] = None,
+        exclude: Optional[Union[Tuple, List]] = None,
+    ) -> Tuple[Any, Optional[dict]]:
+        """returns (result class, mongo projection) for only/exclude params"""
+        document_class = self.odm_manager.document
+        fields = resolve_projection(document_class, only, exclude)
+        if fields is None:
+            return document_class, None
+        return get_partial_type(document_class, fields), generate_projection(fields)
+
     async def find_one(
         self,
         logical_query: Union[Q, QCombination, None] = None,
@@ -274,6 +619,11 @@ class Builder(object):
         session: Optional[ClientSession] = None,
         sort: Optional[int] = None,
         with_relations_objects: bool = False,
+        prefetch: Optional[Union[Tuple, List]] = None,
+        max_depth: Optional[int] = None,
+        relation_strategy: str = RELATION_STRATEGY_IN,
+        only: Optional[Union[Tuple, List]] = None,
+        exclude: Optional[Union[Tuple, List]] = None,
         **query,
     ) -> Optional["Document"]:
         """find one document
@@ -283,27 +633,307 @@ class Builder(object):
             session (Optional[ClientSession], optional): motor session. Defaults to None.
             sort_fields (Optional[Union[Tuple, List]], optional): iterable from sort fielda. Defaults to None.
             sort (Optional[int], optional): sort value -1 or 1. Defaults to None.
+            with_relations_objects (bool, optional): load relation objects. Defaults to False.
+            prefetch (Optional[Union[Tuple, List]], optional): load only these relation paths, e.g. ("author", "author.company"). Defaults to None.
+            max_depth (Optional[int], optional): relation levels to load, all if None. Defaults to None.
+            relation_strategy (str, optional): "in" - find per relation class and level, "lookup" - one aggregation with $lookup. Defaults to "in".
+            only (Optional[Union[Tuple, List]], optional): fetch only these fields (and _id). Defaults to None.
+            exclude (Optional[Union[Tuple, List]], optional): fetch all fields except these. Defaults to None.
 
         Returns:
-            Optional[MongoModel]: MongoModel instance or None
+            Optional[MongoModel]: MongoModel instance, PartialDocument if projected or None
         """
         sort, sort_fields = sort_validation(sort, sort_fields)
+        document_class, projection = self._resolve_projection(only, exclude)
+        if self._use_lookup(
+            with_relations_objects or bool(prefetch), relation_strategy, projection
+        ):
+            found = await self._find_lookup(
+                logical_query,
+                None,
+                1,
+                session,
+                sort_fields,
+                (sort or 1) if sort_fields else None,
+                prefetch,
+                max_depth,
+                query,
+            )
+            return found[0] if found else None
         data = await self._make_query(
             "find_one",
             logical_query or query,
             logical=bool(logical_query),
             sort=[(field, sort or 1) for field in sort_fields] if sort_fields else None,
+            projection=projection,
             session=session,
         )
         if data is not None:
-            obj = self.odm_manager.document.from_bson(data)
+            obj = document_class.from_bson(data)
+            with_relations_objects = with_relations_objects or bool(prefetch)
             if with_relations_objects and self.odm_manager.__document__.has_relations:
                 obj = await self.odm_manager.relation_manager.map_relation_for_single(  # type: ignore
-                    obj
+                    obj, prefetch, max_depth
                 )
             return obj
         return None
 
+    def _find_filter(
+        self,
+        logical_query: Union[Q, QCombination, None],
+        query: dict,
+        seek: Optional[dict] = None,
+    ) -> "DictStrAny":
+        if bool(logical_query):
+            query_params = self._check_query_args(logical_query)
+        else:
+            query_params = self._validate_query_data(query)
+        if seek:
+            query_params = {"$and": [query_params, seek]} if query_params else seek
+        return query_params
+
+    def _find_cursor(
+        self,
+        cursor_method_name: str,
+        logical_query: Union[Q, QCombination, None],
+        skip_rows: Optional[int],
+        limit_rows: Optional[int],
+        session: Optional[ClientSession],
+        sort_fields: Optional[Union[Tuple, List]],
+        sort: Optional[int],
+        projection: Optional[dict],
+        batch_size: Optional[int],
+        query: dict,
+        seek: Optional[dict] = None,
+        query_params: Optional[dict] = None,
+    ) -> Any:
+        """build motor cursor for find or find_raw_batches"""
+        if query_params is None:
+            query_params = self._find_filter(logical_query, query, seek)
+        find_cursor_method = getattr(self._collection, cursor_method_name)
+        cursor = find_cursor_method(
+            query_params,
+            projection=projection,
+            session=session,
+            collation=self.odm_manager.document.__collation__,
+        )
+        if skip_rows is not None:
+            cursor = cursor.skip(skip_rows)
+        if limit_rows:
+            cursor = cursor.limit(limit_rows)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        if sort:
+            cursor.sort([(field, sort or 1) for field in sort_fields])  # type: ignore
+        return cursor
+
+    @staticmethod
+    def _validate_find_mode(
+        with_relations_objects: bool, lazy: bool, as_raw: bool
+    ) -> None:
+        if lazy and as_raw:
+            raise QueryValidationError("lazy cant be used with as_raw")
+        if with_relations_objects and (lazy or as_raw):
+            raise QueryValidationError(
+                "lazy or as_raw cant be used with with_relations_objects"
+            )
+
+    def _use_lookup(
+        self, with_relations_objects: bool, relation_strategy: str, projection: Any
+    ) -> bool:
+        if relation_strategy not in RELATION_STRATEGIES:
+            raise QueryValidationError(
+                f"relation_strategy must be one of {RELATION_STRATEGIES}"
+            )
+        if relation_strategy != RELATION_STRATEGY_LOOKUP or not with_relations_objects:
+            return False
+        if projection:
+            raise QueryValidationError(
+                "only or exclude cant be used with lookup relation strategy"
+            )
+        return self.odm_manager.document.has_relations
+
+    async def _find_lookup(
+        self,
+        logical_query: Union[Q, QCombination, None],
+        skip_rows: Optional[int],
+        limit_rows: Optional[int],
+        session: Optional[ClientSession],
+        sort_fields: Optional[Union[Tuple, List]],
+        sort: Optional[int],
+        prefetch: Optional[Union[Tuple, List]],
+        max_depth: Optional[int],
+        query: dict,
+    ) -> List["Document"]:
+        """find with relation objects joined by $lookup in one round trip"""
+        plan = get_lookup_plan(
+            self.odm_manager.document, tuple(prefetch) if prefetch else None, max_depth
+        )
+        if bool(logical_query):
+            query_params = self._check_query_args(logical_query)
+        else:
+            query_params = self._validate_query_data(query)
+        pipeline: List[dict] = [{"$match": query_params}]
+        if sort:
+            pipeline.append({"$sort": {field: sort for field in sort_fields}})  # type: ignore
+        if skip_rows:
+            pipeline.append({"$skip": skip_rows})
+        if limit_rows:
+            pipeline.append({"$limit": limit_rows})
+        pipeline.extend(plan.stages)
+        identity_map: dict = {}
+        return [
+            plan.from_bson(row, identity_map)
+            async for row in await self._motor_aggreggate_call(pipeline, session)
+        ]
+
+    async def _find_chunked(
+        self,
+        queries: List[dict],
+        skip_rows: Optional[int],
+        limit_rows: Optional[int],
+        session: Optional[ClientSession],
+        sort_fields: Union[Tuple, List],
+        sort: int,
+        projection: Optional[dict],
+        batch_size: Optional[int],
+    ) -> Optional[List[RawBSONDocument]]:
+        """sorted find for queries from split_in_query, chunks run concurrently
+
+        Chunk results are buffered and merged in server sort order, duplicates
+        are dropped by _id, skip and limit are applied to the merged result.
+
+        Returns:
+            Optional[List[RawBSONDocument]]: rows or None if sorted rows cant be
+                merged (collation, unsupported sort values), query must not be split
+        """
+        if self.odm_manager.document.__collation__ is not None:
+            # collation string order is known only to server
+            return None
+        chunk_limit = (skip_rows or 0) + limit_rows if limit_rows else None
+        semaphore = asyncio.Semaphore(DEFAULT_IN_CONCURRENCY)
+
+        async def find_chunk(query_params: dict) -> List[RawBSONDocument]:
+            async with semaphore:
+                cursor = self._find_cursor(
+                    "find",
+                    None,
+                    None,
+                    chunk_limit,
+                    session,
+                    sort_fields,
+                    sort,
+                    projection,
+                    batch_size,
+                    {},
+                    query_params=query_params,
+                )
+                try:
+                    return await cursor.to_list(None)
+                finally:
+                    await cursor.close()
+
+        results = await asyncio.gather(*[find_chunk(q) for q in queries])
+        fields = tuple(sort_fields)
+        keyed = []
+        for result in results:
+            chunk = []
+            for row in result:
+                key = sort_key(row, fields, sort)
+                if key is None:
+                    return None
+                chunk.append((key, row))
+            keyed.append(chunk)
+        merged = []
+        seen = set()
+        for _, row in heapq.merge(*keyed, key=itemgetter(0), reverse=sort == -1):
+            object_id = row.get("_id")
+            if object_id is not None:
+                if object_id in seen:
+                    continue
+                seen.add(object_id)
+            merged.append(row)
+        start = skip_rows or 0
+        return merged[start : start + limit_rows] if limit_rows else merged[start:]
+
+    async def _iterate_chunked(
+        self,
+        queries: List[dict],
+        skip_rows: Optional[int],
+        limit_rows: Optional[int],
+        session: Optional[ClientSession],
+        projection: Optional[dict],
+        batch_size: Optional[int],
+    ) -> AsyncGenerator:
+        """unsorted find for queries from split_in_query, rows are streamed
+
+        Chunk cursors are read concurrently into bounded buffer, rows are
+        yielded in arrival order. Duplicates are dropped by _id, skip and
+        limit are applied to yielded rows.
+        """
+        chunk_limit = (skip_rows or 0) + limit_rows if limit_rows else None
+        semaphore = asyncio.Semaphore(DEFAULT_IN_CONCURRENCY)
+        buffer: asyncio.Queue = asyncio.Queue(DEFAULT_IN_BUFFER_SIZE)
+
+        # chunk reader puts None when it is done or (error,) when it failed
+        async def read_chunk(query_params: dict) -> None:
+            try:
+                async with semaphore:
+                    cursor = self._find_cursor(
+                        "find",
+                        None,
+                        None,
+                        chunk_limit,
+                        session,
+                        None,
+                        None,
+                        projection,
+                        batch_size,
+                        {},
+                        query_params=query_params,
+                    )
+                    try:
+                        async for row in cursor:
+                            await buffer.put(row)
+                    finally:
+                        await cursor.close()
+            except Exception as e:
+                await buffer.put((e,))
+            else:
+                await buffer.put(None)
+
+        tasks = [asyncio.ensure_future(read_chunk(q)) for q in queries]
+        try:
+            running = len(tasks)
+            skip = skip_rows or 0
+            left = limit_rows
+            seen = set()
+            while running:
+                row = await buffer.get()
+                if row is None:
+                    running -= 1
+                    continue
+                if isinstance(row, tuple):
+                    raise row[0]
+                object_id = row.get("_id")
+                if object_id is not None:
+                    if object_id in seen:
+                        continue
+                    seen.add(object_id)
+                if skip:
+                    skip -= 1
+                    continue
+                yield row
+                if left:
+                    left -= 1
+                    if not left:
+                        return
+        finally:
+            # stop chunk readers on limit, error or early break
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def _find(
         self,
         logical_query: Union[Q, QCombination, None] = None,
@@ -312,28 +942,262 @@ class Builder(object):
         session: Optional[ClientSession] = None,
         sort_fields: Optional[Union[Tuple, List]] = None,
         sort: Optional[int] = None,
+        lazy: bool = False,
+        only: Optional[Union[Tuple, List]] = None,
+        exclude: Optional[Union[Tuple, List]] = None,
+        batch_size: Optional[int] = None,
+        as_raw: bool = False,
         **query,
-    ) -> AsyncIterable:
+    ) -> AsyncGenerator:
         sort, sort_fields_parsed = sort_validation(sort, sort_fields)
+        document_class, projection = self._resolve_projection(only, exclude)
+
+        def convert(doc: RawBSONDocument) -> Any:
+            if as_raw:
+                return doc
+            if lazy:
+                return LazyDocument(document_class, doc)
+            return document_class.from_bson(doc)
 
         async def context():
-            if bool(logical_query):
-                query_params = self._check_query_args(logical_query)
-            else:
-                query_params = self._validate_query_data(query)
-            find_cursor_method = getattr(self._collection, "find")
-            cursor = find_cursor_method(query_params, session=session)
-            if skip_rows is not None:
-                cursor = cursor.skip(skip_rows)
-            if limit_rows:
-                cursor = cursor.limit(limit_rows)
-            if sort:
-                cursor.sort([(field, sort or 1) for field in sort_fields_parsed])
-            async for doc in cursor:
-                yield self.odm_manager.document.from_bson(doc)
+            query_params = self._find_filter(logical_query, query)
+            chunks = split_in_query(query_params)
+            if chunks is not None and not sort:
+                rows = self._iterate_chunked(
+                    chunks, skip_rows, limit_rows, session, projection, batch_size
+                )
+                try:
+                    async for doc in rows:
+                        yield convert(doc)
+                finally:
+                    await rows.aclose()
+                return
+            if chunks is not None:
+                sorted_rows = await self._find_chunked(
+                    chunks,
+                    skip_rows,
+                    limit_rows,
+                    session,
+                    sort_fields_parsed,
+                    sort,
+                    projection,
+                    batch_size,
+                )
+                if sorted_rows is not None:
+                    for doc in sorted_rows:
+                        yield convert(doc)
+                    return
+            cursor = self._find_cursor(
+                "find",
+                logical_query,
+                skip_rows,
+                limit_rows,
+                session,
+                sort_fields_parsed,
+                sort,
+                projection,
+                batch_size,
+                query,
+                query_params=query_params,
+            )
+            try:
+                if as_raw:
+                    async for doc in cursor:
+                        yield doc
+                elif lazy:
+                    async for doc in cursor:
+                        yield LazyDocument(document_class, doc)
+                else:
+                    async for doc in cursor:
+                        yield document_class.from_bson(doc)
+            finally:
+                # release server cursor on early break or cancellation
+                await cursor.close()
 
         return context()
 
+    async def iterate(
+        self,
+        logical_query: Union[Q, QCombination, None] = None,
+        skip_rows: Optional[int] = None,
+        limit_rows: Optional[int] = None,
+        session: Optional[ClientSession] = None,
+        sort_fields: Optional[Union[Tuple, List]] = None,
+        sort: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        with_relations_objects: bool = False,
+        prefetch: Optional[Union[Tuple, List]] = None,
+        max_depth: Optional[int] = None,
+        lazy: bool = False,
+        only: Optional[Union[Tuple, List]] = None,
+        exclude: Optional[Union[Tuple, List]] = None,
+        as_raw: bool = False,
+        **query,
+    ) -> AsyncIterator:
+        """streaming find, documents are yielded while cursor is read
+
+        Sorted query with huge $in filter split by split_in_query is buffered
+        to merge chunk results, unsorted chunks are streamed.
+
+        Usage:
+            async for doc in Document.Q().iterate(batch_size=500, name="x"):
+                ...
+
+        Args:
+            logical_query (Union[Q, QCombination, None], optional): Query|LogicalCombunation. Defaults to None.
+            skip_rows (Optional[int], optional): skip rows. Defaults to None.
+            limit_rows (Optional[int], optional): limit rows. Defaults to None.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+            sort_fields (Optional[Union[Tuple, List]], optional): iterable from sort fielda. Defaults to None.
+            sort (Optional[int], optional): sort value -1 or 1. Defaults to None.
+            batch_size (Optional[int], optional): cursor batch size, also size of relation batches. Defaults to None.
+            with_relations_objects (bool, optional): load relation objects per batch. Defaults to False.
+            prefetch (Optional[Union[Tuple, List]], optional): load only these relation paths, e.g. ("author", "author.company"). Defaults to None.
+            max_depth (Optional[int], optional): relation levels to load, all if None. Defaults to None.
+            lazy (bool, optional): yield LazyDocument proxies. Defaults to False.
+            only (Optional[Union[Tuple, List]], optional): fetch only these fields (and _id). Defaults to None.
+            exclude (Optional[Union[Tuple, List]], optional): fetch all fields except these. Defaults to None.
+            as_raw (bool, optional): yield RawBSONDocument rows without decoding. Defaults to False.
+
+        Raises:
+            QueryValidationError: if lazy or as_raw used with with_relations_objects
+
+        Returns:
+            AsyncIterator: documents
+        """
+        with_relations_objects = with_relations_objects or bool(prefetch)
+        self._validate_find_mode(with_relations_objects, lazy, as_raw)
+        relation_manager = (
+            self.odm_manager.relation_manager if with_relations_objects else None
+        )
+        result = await self._find(
+            logical_query,
+            skip_rows,
+            limit_rows,
+            session,
+            sort_fields,
+            sort,
+            lazy=lazy,
+            only=only,
+            exclude=exclude,
+            batch_size=batch_size,
+            as_raw=as_raw,
+            **query,
+        )
+        try:
+            if relation_manager is None:
+                async for doc in result:
+                    yield doc
+                return
+            relation_batch_size = batch_size or DEFAULT_RELATION_BATCH_SIZE
+            batch = []
+            async for doc in result:
+                batch.append(doc)
+                if len(batch) >= relation_batch_size:
+                    for mapped in await relation_manager.map_relation_for_array(
+                        batch, prefetch, max_depth
+                    ):
+                        yield mapped
+                    batch = []
+            if batch:
+                for mapped in await relation_manager.map_relation_for_array(
+                    batch, prefetch, max_depth
+                ):
+                    yield mapped
+        finally:
+            await result.aclose()
+
+    async def iterate_raw_batches(
+        self,
+        logical_query: Union[Q, QCombination, None] = None,
+        skip_rows: Optional[int] = None,
+        limit_rows: Optional[int] = None,
+        session: Optional[ClientSession] = None,
+        sort_fields: Optional[Union[Tuple, List]] = None,
+        sort: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        only: Optional[Union[Tuple, List]] = None,
+        exclude: Optional[Union[Tuple, List]] = None,
+        **query,
+    ) -> AsyncIterator[bytes]:
+        """stream server batches as concatenated bson bytes (pymongo find_raw_batches)
+
+        Batches can be forwarded as is or decoded with bson.decode_all.
+
+        Returns:
+            AsyncIterator[bytes]: raw bson batches
+        """
+        sort, sort_fields_parsed = sort_validation(sort, sort_fields)
+        _, projection = self._resolve_projection(only, exclude)
+        cursor = self._find_cursor(
+            "find_raw_batches",
+            logical_query,
+            skip_rows,
+            limit_rows,
+            session,
+            sort_fields_parsed,
+            sort,
+            projection,
+            batch_size,
+            query,
+        )
+        try:
+            async for batch in cursor:
+                yield batch
+        finally:
+            await cursor.close()
+
+    async def find_columns(
+        self,
+        fields: Union[Tuple, List],
+        logical_query: Union[Q, QCombination, None] = None,
+        skip_rows: Optional[int] = None,
+        limit_rows: Optional[int] = None,
+        session: Optional[ClientSession] = None,
+        sort_fields: Optional[Union[Tuple, List]] = None,
+        sort: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        dictionary_encode: bool = False,
+        **query,
+    ) -> Dict[str, Any]:
+        """columnar find, numpy arrays are filled straight from raw cursor rows
+
+        Only requested fields are fetched and documents are never built.
+
+        Args:
+            fields (Union[Tuple, List]): document fields
+            logical_query (Union[Q, QCombination, None], optional): Query|LogicalCombunation. Defaults to None.
+            skip_rows (Optional[int], optional): skip rows. Defaults to None.
+            limit_rows (Optional[int], optional): limit rows. Defaults to None.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+            sort_fields (Optional[Union[Tuple, List]], optional): iterable from sort fielda. Defaults to None.
+            sort (Optional[int], optional): sort value -1 or 1. Defaults to None.
+            batch_size (Optional[int], optional): cursor batch size. Defaults to None.
+            dictionary_encode (bool, optional): str fields as DictionaryColumn. Defaults to False.
+
+        Returns:
+            Dict[str, Any]: field -> numpy array | DictionaryColumn
+        """
+        builder = ColumnBuilder(self.odm_manager.document, fields, dictionary_encode)
+        result = await self._find(
+            logical_query,
+            skip_rows,
+            limit_rows,
+            session,
+            sort_fields,
+            sort,
+            only=fields,
+            batch_size=batch_size,
+            as_raw=True,
+            **query,
+        )
+        try:
+            async for raw in result:
+                builder.append(lambda field: inflate_raw(raw.get(field)))
+        finally:
+            await result.aclose()
+        return builder.build()
+
     async def find(
         self,
         logical_query: Union[Q, QCombination, None] = None,
@@ -343,8 +1207,15 @@ class Builder(object):
         sort_fields: Optional[Union[Tuple, List]] = None,
         sort: Optional[int] = None,
         with_relations_objects: bool = False,
+        prefetch: Optional[Union[Tuple, List]] = None,
+        max_depth: Optional[int] = None,
+        relation_strategy: str = RELATION_STRATEGY_IN,
+        lazy: bool = False,
+        only: Optional[Union[Tuple, List]] = None,
+        exclude: Optional[Union[Tuple, List]] = None,
+        as_raw: bool = False,
         **query,
-    ) -> FindResult:
+    ) -> Union[FindResult, RawFindResult]:
         """find method
 
         Args:
@@ -354,18 +1225,136 @@ class Builder(object):
             session (Optional[ClientSession], optional): pymongo session. Defaults to None.
             sort_fields (Optional[Union[Tuple, List]], optional): iterable from sort fielda. Defaults to None.
             sort (Optional[int], optional): sort value -1 or 1. Defaults to None.
+            with_relations_objects (bool, optional): load relation objects. Defaults to False.
+            prefetch (Optional[Union[Tuple, List]], optional): load only these relation paths, e.g. ("author", "author.company"). Defaults to None.
+            max_depth (Optional[int], optional): relation levels to load, all if None. Defaults to None.
+            relation_strategy (str, optional): "in" - find per relation class and level, "lookup" - one aggregation with $lookup. Defaults to "in".
+            lazy (bool, optional): return LazyDocument proxies, fields are decoded on first access. Defaults to False.
+            only (Optional[Union[Tuple, List]], optional): fetch only these fields (and _id). Defaults to None.
+            exclude (Optional[Union[Tuple, List]], optional): fetch all fields except these. Defaults to None.
+            as_raw (bool, optional): return RawFindResult with undecoded rows. Defaults to False.
+
+        Raises:
+            QueryValidationError: if lazy or as_raw used with with_relations_objects
 
         Returns:
-            FindResult: Motordantic FindResult
+            Union[FindResult, RawFindResult]: Motordantic FindResult
         """
+        with_relations_objects = with_relations_objects or bool(prefetch)
+        self._validate_find_mode(with_relations_objects, lazy, as_raw)
+        if self._use_lookup(
+            with_relations_objects, relation_strategy, only or exclude
+        ):
+            sort, sort_fields = sort_validation(sort, sort_fields)
+            data = await self._find_lookup(
+                logical_query,
+                skip_rows,
+                limit_rows,
+                session,
+                sort_fields,
+                sort,
+                prefetch,
+                max_depth,
+                query,
+            )
+            return FindResult(self.odm_manager.document, data)
         result = await self._find(
-            logical_query, skip_rows, limit_rows, session, sort_fields, sort, **query
+            logical_query,
+            skip_rows,
+            limit_rows,
+            session,
+            sort_fields,
+            sort,
+            lazy=lazy,
+            only=only,
+            exclude=exclude,
+            as_raw=as_raw,
+            **query,
         )
         data = [doc async for doc in result]
+        if as_raw:
+            return RawFindResult(self.odm_manager.document, data)
         if with_relations_objects and self.odm_manager.__document__.has_relations:
-            data = await self.odm_manager.relation_manager.map_relation_for_array(data)  # type: ignore
+            data = await self.odm_manager.relation_manager.map_relation_for_array(  # type: ignore
+                data, prefetch, max_depth
+            )
         return FindResult(self.odm_manager.document, data)
 
+    async def paginate(
+        self,
+        logical_query: Union[Q, QCombination, None] = None,
+        sort_fields: Optional[Union[Tuple, List]] = None,
+        sort: int = 1,
+        after: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        session: Optional[ClientSession] = None,
+        with_relations_objects: bool = False,
+        prefetch: Optional[Union[Tuple, List]] = None,
+        max_depth: Optional[int] = None,
+        **query,
+    ) -> PageResult:
+        """keyset pagination, page is found by range on sort key instead of skip
+
+        Sort key is sort_fields plus _id as tiebreaker, so each page costs the
+        same for any page depth with index on the sort key. Sort fields must
+        not contain null or missing values.
+
+        Args:
+            logical_query (Union[Q, QCombination, None], optional): Query | QueryCombination. Defaults to None.
+            sort_fields (Optional[Union[Tuple, List]], optional): sort fields, _id if empty. Defaults to None.
+            sort (int, optional): sort value -1 or 1. Defaults to 1.
+            after (Optional[str], optional): next_token of previous page. Defaults to None.
+            limit (int, optional): page size. Defaults to DEFAULT_PAGE_SIZE.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+            with_relations_objects (bool, optional): load relation objects. Defaults to False.
+            prefetch (Optional[Union[Tuple, List]], optional): load only these relation paths, e.g. ("author", "author.company"). Defaults to None.
+            max_depth (Optional[int], optional): relation levels to load, all if None. Defaults to None.
+
+        Raises:
+            QueryValidationError: invalid token, token made for other sort or
+                dotted sort field through array
+
+        Returns:
+            PageResult: documents and next_token (None for last page)
+        """
+        sort, _ = sort_validation(sort, sort_fields)
+        if limit < 1:
+            raise ValueError("limit must be greater than 0")
+        fields = key_fields(sort_fields)
+        check_sort_paths(self.odm_manager.document, fields)
+        seek = None
+        if after:
+            seek = seek_query(fields, decode_token(after, fields, sort), sort)
+        cursor = self._find_cursor(
+            "find",
+            logical_query,
+            None,
+            limit + 1,
+            session,
+            fields,
+            sort,
+            None,
+            None,
+            query,
+            seek=seek,
+        )
+        try:
+            rows = await cursor.to_list(limit + 1)
+        finally:
+            await cursor.close()
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_token = encode_token(fields, sort, row_key(rows[-1], fields))
+        document_class = self.odm_manager.document
+        data = [document_class.from_bson(row) for row in rows]
+        with_relations_objects = with_relations_objects or bool(prefetch)
+        if with_relations_objects and self.odm_manager.__document__.has_relations:
+            data = await self.odm_manager.relation_manager.map_relation_for_array(  # type: ignore
+                data, prefetch, max_depth
+            )
+        return PageResult(document_class, data, next_token)
+
     def _prepare_update_data(self, **fields) -> tuple:
         """prepare and validate query data for update queries"""
 
@@ -382,13 +1371,107 @@ class Builder(object):
                 query_params.update({name: value})
         return query_params, set_values
 
+    def _validate_update_values(self, values: Dict[str, Any]) -> "DictStrAny":
+        """validate values of update operator in one pass
+
+        Args:
+            values (Dict[str, Any]): field name -> value, dotted names are not validated
+
+        Raises:
+            NotDeclaredField: if field is not declared in document
+
+        Returns:
+            Dict: validated values, database excluded fields are skipped
+        """
+        document = self.odm_manager.document
+        struct_fields = document.__struct_fields__
+        exclude_fields = document.__database_exclude_fields__
+        validators = document.__validators__
+        validated = {}
+        for name, value in values.items():
+            field, _, inner = name.partition(".")
+            if field not in struct_fields:
+                raise NotDeclaredField(field, list(struct_fields))
+            if field in exclude_fields:
+                continue
+            if not inner:
+                validator = validators.get(field)
+                if validator is None:
+                    validator = get_field_validator(document, field)
+                value = validator(value)
+            validated[name] = value
+        return validated
+
+    def _validate_inc_values(self, values: Dict[str, Any]) -> "DictStrAny":
+        """check $inc values, numbers are sent as is without field conversion
+
+        Raises:
+            NotDeclaredField: if field is not declared in document
+            QueryValidationError: if value or field is not number, or value is not
+                int for int field
+
+        Returns:
+            Dict: values, database excluded fields are skipped
+        """
+        document = self.odm_manager.document
+        struct_fields = document.__struct_fields__
+        exclude_fields = document.__database_exclude_fields__
+        validated = {}
+        for name, value in values.items():
+            field, _, inner = name.partition(".")
+            if field not in struct_fields:
+                raise NotDeclaredField(field, list(struct_fields))
+            if field in exclude_fields:
+                continue
+            if isinstance(value, bool) or not isinstance(value, INC_TYPES):
+                raise QueryValidationError(f"field - {name}, $inc value must be number")
+            field_type = None
+            if not inner:
+                field_type = get_field_validator(document, field).field_type
+            if isinstance(field_type, type) and (
+                field_type is bool or not issubclass(field_type, INC_TYPES)
+            ):
+                raise QueryValidationError(f"field - {name} is not number field")
+            # float step would store double in int field
+            if field_type is int and not isinstance(value, int):
+                raise QueryValidationError(f"field - {name}, $inc value must be int")
+            validated[name] = value
+        return validated
+
+    def _prepare_update(
+        self,
+        set: Optional[Dict[str, Any]] = None,
+        inc: Optional[Dict[str, Any]] = None,
+        unset: Union[List[str], Tuple[str, ...], None] = None,
+    ) -> "DictStrAny":
+        """mongo update document from structured update params"""
+        update: dict = {}
+        if set:
+            update["$set"] = self._validate_update_values(set)
+        if inc:
+            update["$inc"] = self._validate_inc_values(inc)
+        if unset:
+            struct_fields = self.odm_manager.document.__struct_fields__
+            for name in unset:
+                field = name.partition(".")[0]
+                if field not in struct_fields:
+                    raise NotDeclaredField(field, list(struct_fields))
+            update["$unset"] = {name: "" for name in unset}
+        if not any(update.values()):
+            raise QueryValidationError("not fields for updating!")
+        return update
+
     async def _update(
         self,
         method: str,
         query: Dict,
         upsert: bool = True,
         session: Optional[ClientSession] = None,
-    ) -> int:
+        filter: Union[Dict, Q, QCombination, None] = None,
+        set: Optional[Dict[str, Any]] = None,
+        inc: Optional[Dict[str, Any]] = None,
+        unset: Union[List[str], Tuple[str, ...], None] = None,
+    ) -> Optional[int]:
         """innert method for update
 
         Args:
@@ -396,43 +1479,130 @@ class Builder(object):
             query (Dict): update query
             upsert (bool, optional): upsert option. Defaults to True.
             session (Optional[ClientSession], optional): motor session. Defaults to None.
+            filter (Union[Dict, Q, QCombination, None], optional): filter for structured update. Defaults to None.
+            set (Optional[Dict[str, Any]], optional): $set values. Defaults to None.
+            inc (Optional[Dict[str, Any]], optional): $inc values. Defaults to None.
+            unset (Union[List[str], Tuple[str, ...], None], optional): $unset fields. Defaults to None.
 
         Returns:
-            int: updated documents count
+            Optional[int]: updated documents count, None for batched update_one
+                if count cant be taken from batch result
         """
-        query, set_values = self._prepare_update_data(**query)
+        if set is None and inc is None and unset is None:
+            if filter is not None:
+                raise QueryValidationError("not fields for updating!")
+            query, set_values = self._prepare_update_data(**query)
+            update = {"$set": set_values}
+            logical = False
+        else:
+            if filter is not None and query:
+                raise QueryValidationError(
+                    "filter and query params cant be used together"
+                )
+            update = self._prepare_update(set=set, inc=inc, unset=unset)
+            if filter is not None:
+                query = filter  # type: ignore
+            logical = isinstance(query, (Q, QCombination))
+        if (
+            self._write_batcher is not None
+            and method == "update_one"
+            and not upsert
+            and session is None
+        ):
+            return await self._batch_update(query, update, logical)
         r = await self._make_query(
-            method, query, {"$set": set_values}, upsert=upsert, session=session
+            method, query, update, upsert=upsert, session=session, logical=logical
         )
         return r.modified_count
 
+    async def _batch_update(
+        self, query: Any, update: dict, logical: bool = False
+    ) -> Optional[int]:
+        """update_one through write batcher, see WriteBatcher.update"""
+        if logical:
+            query = self._check_query_args(query)
+        else:
+            query = self._validate_query_data(query)
+        collation = self.odm_manager.document.__collation__
+        kwargs = {"collation": collation} if collation is not None else {}
+        return await self._write_batcher.update(  # type: ignore
+            query, update, **kwargs
+        )
+
     async def update_one(
-        self, upsert: bool = False, session: Optional[ClientSession] = None, **query
-    ) -> int:
+        self,
+        upsert: bool = False,
+        session: Optional[ClientSession] = None,
+        filter: Union[Dict, Q, QCombination, None] = None,
+        set: Optional[Dict[str, Any]] = None,
+        inc: Optional[Dict[str, Any]] = None,
+        unset: Union[List[str], Tuple[str, ...], None] = None,
+        **query,
+    ) -> Optional[int]:
         """update one document
 
+        Update is given either as field__set=value query params or as
+        filter + set/inc/unset, e.g. update_one(filter=Q(name="x"), inc={"counter": 1})
+        With Config.write_batch_size calls without session and upsert are sent
+        in batches, see WriteBatcher.
+
         Args:
             upsert (bool, optional): pymongo upsert. Defaults to False.
             session (Optional[ClientSession], optional): motor session. Defaults to None.
+            filter (Union[Dict, Q, QCombination, None], optional): filter, query params are used if not set. Defaults to None.
+            set (Optional[Dict[str, Any]], optional): $set values. Defaults to None.
+            inc (Optional[Dict[str, Any]], optional): $inc values. Defaults to None.
+            unset (Union[List[str], Tuple[str, ...], None], optional): $unset fields. Defaults to None.
 
         Returns:
-            int: updated documents count
+            Optional[int]: updated documents count, batched update may return
+                None, see WriteBatcher.update
         """
-        return await self._update("update_one", query, upsert=upsert, session=session)
+        return await self._update(
+            "update_one",
+            query,
+            upsert=upsert,
+            session=session,
+            filter=filter,
+            set=set,
+            inc=inc,
+            unset=unset,
+        )
 
     async def update_many(
-        self, upsert: bool = False, session: Optional[ClientSession] = None, **query
-    ) -> int:
+        self,
+        upsert: bool = False,
+        session: Optional[ClientSession] = None,
+        filter: Union[Dict, Q, QCombination, None] = None,
+        set: Optional[Dict[str, Any]] = None,
+        inc: Optional[Dict[str, Any]] = None,
+        unset: Union[List[str], Tuple[str, ...], None] = None,
+        **query,
+    ) -> Optional[int]:
         """update many document
 
         Args:
             upsert (bool, optional): pymongo upsert. Defaults to False.
             session (Optional[ClientSession], optional): motor session. Defaults to None.
+            filter (Union[Dict, Q, QCombination, None], optional): filter, query params are used if not set. Defaults to None.
+            set (Optional[Dict[str, Any]], optional): $set values. Defaults to None.
+            inc (Optional[Dict[str, Any]], optional): $inc values. Defaults to None.
+            unset (Union[List[str], Tuple[str, ...], None], optional): $unset fields. Defaults to None.
 
         Returns:
-            int: updated documents count
+            Optional[int]: updated documents count, update_many is never batched
+                so it is always set
         """
-        return await self._update("update_many", query, upsert=upsert, session=session)
+        return await self._update(
+            "update_many",
+            query,
+            upsert=upsert,
+            session=session,
+            filter=filter,
+            set=set,
+            inc=inc,
+            unset=unset,
+        )
 
     async def _find_with_replacement_or_with_update(
         self,
@@ -565,8 +1735,10 @@ class Builder(object):
                 self._collection,
                 "aggregate",
             )
+            collation = self.odm_manager.document.__collation__
+            kwargs = {"collation": collation} if collation is not None else {}
 
-            async for row in aggregate_cursor(data, session=session):
+            async for row in aggregate_cursor(data, session=session, **kwargs):
                 yield row
 
         return context()
@@ -738,6 +1910,33 @@ class Builder(object):
             raise DocumentDoesNotExist(f"{self.odm_manager.document} does not exist.")
         return obj
 
+    async def get_by_id(
+        self,
+        object_id: Union[ObjectId, str],
+        with_relations_objects: bool = False,
+        session: Optional[ClientSession] = None,
+    ) -> Optional["Document"]:
+        """find document by _id, batched with other calls inside DocumentLoader
+
+        Args:
+            object_id (Union[ObjectId, str]): document _id
+            with_relations_objects (bool, optional): load relation objects. Defaults to False.
+            session (Optional[ClientSession], optional): motor session, not batched if set. Defaults to None.
+
+        Returns:
+            Optional[Document]: document or None
+        """
+        loader = get_document_loader()
+        if loader is None or session is not None:
+            return await self.find_one(
+                _id=object_id,
+                with_relations_objects=with_relations_objects,
+                session=session,
+            )
+        return await asyncio.shield(
+            loader.load(self, object_id, with_relations_objects)
+        )
+
     async def create_indexes(
         self,
         indexes: List[IndexModel],
@@ -1,4 +1,5 @@
 from typing import (
+    Callable,
     Optional,
     List,
     Any,
@@ -8,26 +9,64 @@ from typing import (
     Tuple,
     TYPE_CHECKING,
 )
-from re import compile, IGNORECASE
+from functools import lru_cache
+from re import compile, escape, IGNORECASE
 
 from bson import ObjectId, Regex
 from pymongo import UpdateOne
 
 from ..property import cached_classproperty
-from ..validation import validate_field_value
+from ..validation import get_field_validator
 from ..errors import QueryValidationError
+from ..utils import chunk_by_length
 
 __all__ = (
     "ExtraQueryMapper",
+    "compile_regex",
+    "prefix_upper_bound",
     "group_by_aggregate_generation",
     "generate_name_field",
     "bulk_query_generator",
+    "merge_bulk_results",
+    "split_in_query",
 )
 
 if TYPE_CHECKING:
     from ..document import Document
     from ..typing import DocumentType
 
+REGEX_CACHE_SIZE = 1024
+# $in values per query, bigger filters are split by split_in_query
+IN_CHUNK_SIZE = 10000
+
+MAX_UNICODE = 0x10FFFF
+SURROGATES_START = 0xD800
+SURROGATES_END = 0xDFFF
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_regex(pattern: str, flags: int = 0) -> Regex:
+    """cached bson Regex for pattern, pattern is validated with re.compile"""
+    return Regex.from_native(compile(pattern, flags))
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """smallest string greater than all strings starting with prefix
+
+    Strings are compared by code points (utf-8 bytes) with simple collation.
+    Returns None if there is no such string (empty prefix or only max chars).
+    """
+    chars = list(prefix)
+    while chars:
+        code = ord(chars.pop()) + 1
+        if code > MAX_UNICODE:
+            continue
+        if SURROGATES_START <= code <= SURROGATES_END:
+            code = SURROGATES_END + 1
+        chars.append(chr(code))
+        return "".join(chars)
+    return None
+
 
 class ExtraQueryMapper(object):
     """extra mapper for __ queries like find(_id__in=[], name__regex='123')"""
@@ -58,61 +97,114 @@ class ExtraQueryMapper(object):
             return query
         return {}
 
+    def compile(self, extra_methods: List) -> Callable[[Any], Dict]:
+        """resolve extra methods once, returned callable works like query"""
+        operators = []
+        for extra_method in extra_methods:
+            if extra_method == "in":
+                extra_method = "in_"
+            operators.append((extra_method, getattr(self, extra_method)))
+        field_name = self.field_name
+        is_id = field_name == "_id"
+
+        def query(values: Any) -> Dict:
+            if is_id:
+                values = (
+                    [ObjectId(v) for v in values]
+                    if isinstance(values, list)
+                    else ObjectId(values)
+                )
+            query: Dict = {field_name: {}}
+            for extra_method, operator in operators:
+                if extra_method == "inc" or extra_method == "unset":
+                    return operator(values)
+                query[field_name].update(operator(values))
+            return query
+
+        return query
+
     def in_(self, list_values: List) -> dict:
         if not isinstance(list_values, list):
             raise TypeError("values must be a list type")
         try:
             return {
-                "$in": [
-                    validate_field_value(self.document, self.field_name, v)
-                    for v in list_values
-                ]
+                "$in": get_field_validator(self.document, self.field_name).many(
+                    list_values
+                )
             }
         except QueryValidationError:
             return {"$in": list_values}
 
     def regex(self, regex_value: str) -> dict:
-        return {"$regex": Regex.from_native(compile(regex_value))}
+        return {"$regex": compile_regex(regex_value)}
 
     def iregex(self, regex_value: str) -> dict:
-        return {"$regex": Regex.from_native(compile(regex_value, IGNORECASE))}
+        return {"$regex": compile_regex(regex_value, IGNORECASE)}
 
     def regex_ne(self, regex_value: str) -> dict:
-        return {"$not": Regex.from_native(compile(regex_value))}
+        return {"$not": compile_regex(regex_value)}
 
     def ne(self, value: Any) -> dict:
-        return {"$ne": validate_field_value(self.document, self.field_name, value)}
+        return {"$ne": get_field_validator(self.document, self.field_name)(value)}
 
     def startswith(self, value: str) -> dict:
-        return {"$regex": Regex.from_native(compile(f"^{value}"))}
+        return {"$regex": compile_regex(f"^{escape(value)}")}
 
     def istartswith(self, value: str) -> dict:
-        return {"$regex": Regex.from_native(compile(f"^{value}", IGNORECASE))}
+        return {"$regex": compile_regex(f"^{escape(value)}", IGNORECASE)}
 
     def not_startswith(self, value: str) -> dict:
-        return {"$not": Regex.from_native(compile(f"^{value}"))}
+        return {"$not": compile_regex(f"^{escape(value)}")}
 
     def not_istartswith(self, value: str) -> dict:
-        return {"$not": Regex.from_native(compile(f"^{value}", IGNORECASE))}
+        return {"$not": compile_regex(f"^{escape(value)}", IGNORECASE)}
 
     def endswith(self, value: str) -> dict:
-        return {"$regex": Regex.from_native(compile(f"{value}$"))}
+        return {"$regex": compile_regex(f"{escape(value)}$")}
 
     def iendswith(self, value: str) -> dict:
-        return {"$regex": Regex.from_native(compile(f"{value}$", IGNORECASE))}
+        return {"$regex": compile_regex(f"{escape(value)}$", IGNORECASE)}
 
     def not_endswith(self, value: str) -> dict:
-        return {"$not": Regex.from_native(compile(f"{value}$"))}
+        return {"$not": compile_regex(f"{escape(value)}$")}
+
+    def prefix(self, value: str) -> dict:
+        """startswith as range predicate, uses index bounds on b-tree index
+
+        Range is built for simple (binary) collation, with Config.collation
+        anchored regex is used instead. For array fields bounds can be matched
+        by different elements, use startswith there.
+        """
+        if not isinstance(value, str):
+            raise TypeError("value must be a str type")
+        if getattr(self.document, "__collation__", None) is not None:
+            return self.startswith(value)
+        upper_bound = prefix_upper_bound(value)
+        if upper_bound is None:
+            return {"$gte": value}
+        return {"$gte": value, "$lt": upper_bound}
+
+    def iexact(self, value: str) -> dict:
+        """case insensitive equality
+
+        Uses equality when Config.collation is case insensitive (strength 1
+        or 2), so collation index declared in Config.indexes can be used.
+        """
+        if not isinstance(value, str):
+            raise TypeError("value must be a str type")
+        collation = getattr(self.document, "__collation__", None)
+        if collation is not None and collation.document.get("strength") in (1, 2):
+            return {"$eq": value}
+        return {"$regex": compile_regex(f"^{escape(value)}$", IGNORECASE)}
 
     def nin(self, list_values: List) -> dict:
         if not isinstance(list_values, list):
             raise TypeError("values must be a list type")
         try:
             return {
-                "$nin": [
-                    validate_field_value(self.document, self.field_name, v)
-                    for v in list_values
-                ]
+                "$nin": get_field_validator(self.document, self.field_name).many(
+                    list_values
+                )
             }
         except QueryValidationError:
             return {"$nin": list_values}
@@ -135,16 +227,16 @@ class ExtraQueryMapper(object):
         return {"$unset": {self.field_name: value}}
 
     def gte(self, value: Any) -> dict:
-        return {"$gte": validate_field_value(self.document, self.field_name, value)}
+        return {"$gte": get_field_validator(self.document, self.field_name)(value)}
 
     def lte(self, value: Any) -> dict:
-        return {"$lte": validate_field_value(self.document, self.field_name, value)}
+        return {"$lte": get_field_validator(self.document, self.field_name)(value)}
 
     def gt(self, value: Any) -> dict:
-        return {"$gt": validate_field_value(self.document, self.field_name, value)}
+        return {"$gt": get_field_validator(self.document, self.field_name)(value)}
 
     def lt(self, value: Any) -> dict:
-        return {"$lt": validate_field_value(self.document, self.field_name, value)}
+        return {"$lt": get_field_validator(self.document, self.field_name)(value)}
 
     def inc(self, value: int) -> dict:
         if isinstance(value, int):
@@ -154,12 +246,10 @@ class ExtraQueryMapper(object):
     def range(self, range_values: Union[List, Tuple]) -> dict:
         if len(range_values) != 2:
             raise ValueError("range must have 2 params")
-        from_ = range_values[0]
-        to_ = range_values[1]
-        return {
-            "$gte": validate_field_value(self.document, self.field_name, from_),
-            "$lte": validate_field_value(self.document, self.field_name, to_),
-        }
+        from_, to_ = get_field_validator(self.document, self.field_name).many(
+            range_values
+        )
+        return {"$gte": from_, "$lte": to_}
 
     @cached_classproperty
     def methods(cls) -> list:
@@ -167,7 +257,7 @@ class ExtraQueryMapper(object):
         for f in cls.__dict__:
             if f == "in_":
                 methods.append("in")
-            elif not f.startswith("__") and f != "query":
+            elif not f.startswith("__") and f not in ("query", "compile"):
                 methods.append(f)
         return methods
 
@@ -199,8 +289,13 @@ def bulk_query_generator(
     updated_fields: Optional[List] = None,
     query_fields: Optional[List] = None,
     upsert=False,
+    validate_data: Optional[Callable[[dict], dict]] = None,
 ) -> List:
-    """ "helper for generate bulk query"""
+    """ "helper for generate bulk query
+
+    validate_data converts field values to mongo values, see
+    Builder._validate_query_data
+    """
 
     data = []
     if updated_fields:
@@ -210,15 +305,92 @@ def bulk_query_generator(
             for field in updated_fields:
                 value = getattr(obj, field)
                 update.update({field: value})
+            if validate_data is not None:
+                update = validate_data(update)
             data.append(UpdateOne(query, {"$set": update}, upsert=upsert))
     elif query_fields:
         for obj in requests:
             query = {}
             update = {}
-            for field, value in obj.data.items():
+            data_to_update = obj.to_dict(with_props=False)
+            # _id of matched document cant be changed, it is set only on insert
+            object_id = data_to_update.pop("_id", None)
+            for field, value in data_to_update.items():
                 if field not in query_fields:
                     update.update({field: value})
                 else:
                     query.update({field: value})
-            data.append(UpdateOne(query, {"$set": update}, upsert=upsert))
+            if validate_data is not None:
+                query, update = validate_data(query), validate_data(update)
+            update_query = {"$set": update}
+            if "_id" in query_fields:
+                query["_id"] = object_id
+            elif object_id is not None:
+                update_query["$setOnInsert"] = {"_id": object_id}
+            data.append(UpdateOne(query, update_query, upsert=upsert))
     return data
+
+
+def merge_bulk_results(results: List[Tuple[int, dict]]) -> dict:
+    """merge bulk_api_result dicts of chunks, (chunk offset, result) pairs
+
+    Indexes of upserted ids and write errors are shifted to the position of
+    operation in the whole request.
+    """
+    merged: Dict[str, Any] = {
+        "writeErrors": [],
+        "writeConcernErrors": [],
+        "nInserted": 0,
+        "nUpserted": 0,
+        "nMatched": 0,
+        "nModified": 0,
+        "nRemoved": 0,
+        "upserted": [],
+    }
+    for offset, result in results:
+        for key in ("nInserted", "nUpserted", "nMatched", "nModified", "nRemoved"):
+            merged[key] += result.get(key, 0)
+        for key in ("upserted", "writeErrors"):
+            merged[key] += [
+                {**item, "index": item["index"] + offset}
+                for item in result.get(key, [])
+            ]
+        merged["writeConcernErrors"] += result.get("writeConcernErrors", [])
+    return merged
+
+
+def split_in_query(
+    query: dict, chunk_size: int = IN_CHUNK_SIZE
+) -> Optional[List[dict]]:
+    """split biggest top level $in filter with more than chunk_size values
+
+    Values of same type are deduplicated, other conditions are copied to
+    every query.
+    Results of queries may overlap (array fields), they must be merged by _id.
+
+    Returns:
+        Optional[List[dict]]: queries with chunks of values or None if not needed
+    """
+    field, values = None, None
+    for key, value in query.items():
+        if key.startswith("$") or not isinstance(value, dict):
+            continue
+        in_values = value.get("$in")
+        if (
+            isinstance(in_values, list)
+            and len(in_values) > chunk_size
+            and (values is None or len(in_values) > len(values))
+        ):
+            field, values = key, in_values
+    if field is None or values is None:
+        return None
+    try:
+        # True and 1 are equal in python but not in query
+        values = list({(type(value), value): value for value in values}.values())
+    except TypeError:
+        # unhashable values (documents, lists) are sent as is
+        pass
+    return [
+        {**query, field: {**query[field], "$in": chunk}}
+        for chunk in chunk_by_length(values, chunk_size)
+    ]
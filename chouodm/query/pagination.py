@@ -0,0 +1,225 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Union
+
+from bson import (
+    Binary,
+    DBRef,
+    Decimal128,
+    MaxKey,
+    MinKey,
+    ObjectId,
+    Timestamp,
+    encode as bson_encode,
+    decode as bson_decode,
+)
+from bson.datetime_ms import DatetimeMS
+from bson.errors import BSONError
+from bson.raw_bson import RawBSONDocument
+from msgspec import inspect
+
+from ..errors import QueryValidationError
+from ..lazy import inflate_raw
+
+__all__ = (
+    "key_fields",
+    "check_sort_paths",
+    "encode_token",
+    "decode_token",
+    "seek_query",
+    "row_key",
+    "sort_key",
+)
+
+
+def key_fields(sort_fields: Union[Tuple, List, None]) -> Tuple[str, ...]:
+    """sort key for keyset pagination, _id is added as tiebreaker"""
+    fields = tuple(sort_fields or ())
+    if "_id" not in fields:
+        fields += ("_id",)
+    return fields
+
+
+def _through_array(type_info: inspect.Type, parts: List[str]) -> bool:
+    for part in parts:
+        if isinstance(type_info, inspect.UnionType):
+            types = [t for t in type_info.types if not isinstance(t, inspect.NoneType)]
+            if len(types) != 1:
+                return False
+            type_info = types[0]
+        if isinstance(type_info, (inspect.CollectionType, inspect.TupleType)):
+            return True
+        if not isinstance(type_info, inspect.StructType):
+            # dict and Any fields are checked by row_key
+            return False
+        for field in type_info.fields:
+            if part in (field.name, field.encode_name):
+                type_info = field.type
+                break
+        else:
+            return False
+    return False
+
+
+def check_sort_paths(document_class: Any, fields: Tuple[str, ...]) -> None:
+    """dotted sort fields must not go through arrays
+
+    Array element values cant be seeked by one range, row_key also can
+    take only one value per field.
+    """
+    type_info = None
+    for field in fields:
+        if "." not in field:
+            continue
+        if type_info is None:
+            type_info = inspect.type_info(document_class)
+        if _through_array(type_info, field.split(".")):
+            raise QueryValidationError(
+                f"sort field {field} goes through array, cant be used for pagination"
+            )
+
+
+def row_key(row: RawBSONDocument, fields: Tuple[str, ...]) -> List[Any]:
+    """sort key values of raw row, dotted fields are supported"""
+    values = []
+    for field in fields:
+        value: Any = row
+        for part in field.split("."):
+            if isinstance(value, list):
+                raise QueryValidationError(
+                    f"sort field {field} goes through array, "
+                    "cant be used for pagination"
+                )
+            value = value.get(part) if value is not None else None
+        values.append(inflate_raw(value))
+    return values
+
+
+# ranks of BSON types in server sort order, empty array sorts before null
+_MIN_KEY, _EMPTY_ARRAY, _NULL, _NUMBER, _STRING = 0, 1, 2, 3, 4
+_OBJECT, _ARRAY, _BINARY, _OBJECT_ID, _BOOLEAN = 5, 6, 7, 8, 9
+_DATE, _TIMESTAMP, _MAX_KEY = 10, 11, 12
+
+
+def _value_key(value: Any) -> Optional[tuple]:
+    # bool is checked before int, it is a subclass of int
+    if value is None:
+        return (_NULL,)
+    if isinstance(value, bool):
+        return (_BOOLEAN, value)
+    if isinstance(value, Decimal128):
+        value = value.to_decimal()
+        # NaN sorts before all numbers
+        return (_NUMBER, 0) if value.is_nan() else (_NUMBER, 1, value)
+    if isinstance(value, (int, float)):
+        # Int64 is int, NaN is not equal to itself
+        return (_NUMBER, 0) if value != value else (_NUMBER, 1, value)
+    if isinstance(value, str):
+        # code point order is utf-8 bytes order, same as simple collation
+        return (_STRING, value)
+    if isinstance(value, DBRef):
+        value = value.as_doc()
+    if isinstance(value, dict):
+        items = []
+        for name, item in value.items():
+            item_key = _value_key(item)
+            if item_key is None:
+                return None
+            items.append((item_key[0], name, item_key))
+        return (_OBJECT, items)
+    if isinstance(value, list):
+        keys = [_value_key(item) for item in value]
+        if None in keys:
+            return None
+        return (_ARRAY, keys)
+    if isinstance(value, bytes):
+        subtype = value.subtype if isinstance(value, Binary) else 0
+        return (_BINARY, len(value), subtype, bytes(value))
+    if isinstance(value, ObjectId):
+        return (_OBJECT_ID, value.binary)
+    if isinstance(value, (datetime, DatetimeMS)):
+        return (_DATE, int(DatetimeMS(value)))
+    if isinstance(value, Timestamp):
+        return (_TIMESTAMP, value.time, value.inc)
+    if isinstance(value, MinKey):
+        return (_MIN_KEY,)
+    if isinstance(value, MaxKey):
+        return (_MAX_KEY,)
+    # regex, code and other rare types
+    return None
+
+
+def sort_key(
+    row: RawBSONDocument, fields: Tuple[str, ...], sort: int
+) -> Optional[List[tuple]]:
+    """sort key of raw row in server order for simple collation
+
+    Values are ranked by BSON type bracket first. Arrays sort by smallest
+    element ascending and by biggest element descending.
+
+    Returns:
+        Optional[List[tuple]]: key or None if it cant be built for row values
+    """
+    key = []
+    for field in fields:
+        value: Any = row
+        for part in field.split("."):
+            if isinstance(value, list):
+                # dotted path through array matches values of all elements
+                return None
+            value = value.get(part) if value is not None else None
+        value = inflate_raw(value)
+        if isinstance(value, list):
+            if not value:
+                key.append((_EMPTY_ARRAY,))
+                continue
+            keys = [_value_key(item) for item in value]
+            if None in keys:
+                return None
+            key.append(min(keys) if sort == 1 else max(keys))  # type: ignore
+            continue
+        value_key = _value_key(value)
+        if value_key is None:
+            return None
+        key.append(value_key)
+    return key
+
+
+def encode_token(fields: Tuple[str, ...], sort: int, values: List[Any]) -> str:
+    """opaque continuation token for last row of page"""
+    raw = bson_encode({"f": list(fields), "s": sort, "v": values})
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: str, fields: Tuple[str, ...], sort: int) -> List[Any]:
+    """sort key values from token, token must be made for same sort"""
+    try:
+        data = bson_decode(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (BinasciiError, BSONError, ValueError, TypeError):
+        raise QueryValidationError("invalid pagination token")
+    if data.get("f") != list(fields) or data.get("s") != sort:
+        raise QueryValidationError("pagination token was made for other sort")
+    values = data.get("v")
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise QueryValidationError("invalid pagination token")
+    return values
+
+
+def seek_query(
+    fields: Tuple[str, ...], values: List[Any], sort: int
+) -> Optional[dict]:
+    """rows after key values: (f1 > v1) or (f1 == v1 and f2 > v2) or ...
+
+    Sort key fields must not contain null or missing values, comparison
+    operators never match them.
+    """
+    operator = "$gt" if sort == 1 else "$lt"
+    branches = []
+    for index, field in enumerate(fields):
+        branch = {f: v for f, v in zip(fields[:index], values[:index])}
+        branch[field] = {operator: values[index]}
+        branches.append(branch)
+    if len(branches) == 1:
+        return branches[0]
+    return {"$or": branches}
@@ -1,6 +1,11 @@
-import copy
+import datetime
+import logging
 from json import dumps
+from re import Pattern
 from typing import (
+    Callable,
+    Dict,
+    Optional,
     Generator,
     List,
     Union,
@@ -11,16 +16,19 @@ from typing import (
     Union,
 )
 
-from bson import ObjectId
+from bson import ObjectId, Regex
+from pymongo.collation import Collation
 
 from .extra import ExtraQueryMapper
 
-from ..validation import validate_field_value
+from ..validation import get_field_validator
 
 
 __all__ = (
     "Q",
     "QCombination",
+    "QueryPlan",
+    "optimize_query",
     "FindResult",
     "SimpleAggregateResult",
     "generate_basic_query",
@@ -33,83 +41,222 @@ if TYPE_CHECKING:
     from .builder import Builder
 
 
+logger = logging.getLogger(__name__)
+
+# operators which are evaluated independently when declared for one field
+MERGEABLE_OPERATORS = frozenset(
+    ("$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin", "$exists", "$type")
+)
+LOWER_BOUNDS = frozenset(("$gt", "$gte"))
+UPPER_BOUNDS = frozenset(("$lt", "$lte"))
+ORDERED_TYPES = ((int, float), (str,), (datetime.datetime,))
+
+
 def _validate_query_data(builder: "Builder", query: dict) -> dict:
     return builder._validate_query_data(query)
 
 
-class QNodeVisitor(object):
-    """Base visitor class for visiting Q-object nodes in a query tree."""
+def _is_operators(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(isinstance(k, str) and k.startswith("$") for k in value)
+    )
 
-    def prepare_combination(
-        self, combination: "QCombination"
-    ) -> Union["QCombination", dict]:
-        """Called by QCombination objects."""
-        return combination
 
-    def visit_query(self, query: "Q") -> Union["Q", dict]:
-        """Called by (New)Q objects."""
-        return query
+def _same_ordered_type(
+    first: Any, second: Any, collation: Optional[Collation] = None
+) -> bool:
+    if isinstance(first, bool) or isinstance(second, bool):
+        return False
+    if isinstance(first, str) and collation is not None:
+        # collation order of strings is known only to server
+        return False
+    if isinstance(first, datetime.datetime) and isinstance(second, datetime.datetime):
+        # naive and aware datetimes are not comparable
+        return (first.tzinfo is None) == (second.tzinfo is None)
+    return any(
+        isinstance(first, types) and isinstance(second, types)
+        for types in ORDERED_TYPES
+    )
+
+
+def _merge_operators(
+    first: dict, second: dict, collation: Optional[Collation] = None
+) -> Optional[dict]:
+    """merge operators for one field, None if result is not equivalent"""
+    if not all(k in MERGEABLE_OPERATORS for k in first) or not all(
+        k in MERGEABLE_OPERATORS for k in second
+    ):
+        return None
+    merged = dict(first)
+    for operator, value in second.items():
+        if operator not in merged:
+            merged[operator] = value
+            continue
+        current = merged[operator]
+        if current == value and type(current) is type(value):
+            continue
+        # "some element > a" and "some element > b" is "some element > max(a, b)"
+        if not _same_ordered_type(current, value, collation):
+            return None
+        if operator in LOWER_BOUNDS:
+            merged[operator] = max(current, value)
+        elif operator in UPPER_BOUNDS:
+            merged[operator] = min(current, value)
+        else:
+            return None
+    return merged
 
 
-class SimplificationVisitor(QNodeVisitor):
-    def __init__(self, builder: "Builder"):
-        self.builder = builder
+def _optimize_and(
+    conditions: List[dict], collation: Optional[Collation] = None
+) -> dict:
+    """flatten conjunction into one filter document where keys allow it"""
+    merged: dict = {}
+    rest: List[dict] = []
+    for condition in conditions:
+        for key, value in condition.items():
+            if key not in merged:
+                merged[key] = value
+                continue
+            current = merged[key]
+            operators = None
+            if _is_operators(current) and _is_operators(value):
+                operators = _merge_operators(current, value, collation)
+            if operators is None:
+                rest.append({key: value})
+            else:
+                merged[key] = operators
+    if not rest:
+        return merged
+    return {"$and": [merged, *rest]}
+
+
+def _equality_values(branch: dict) -> Optional[Tuple[str, list]]:
+    """(field, values) if $or branch is equality or $in for one field"""
+    if len(branch) != 1:
+        return None
+    field, value = next(iter(branch.items()))
+    if field.startswith("$"):
+        return None
+    if isinstance(value, dict):
+        if len(value) == 1 and isinstance(value.get("$in"), list):
+            return field, value["$in"]
+        return None
+    if isinstance(value, (list, tuple, Regex, Pattern)):
+        return None
+    return field, [value]
+
+
+def _optimize_or(branches: List[dict]) -> dict:
+    """equalities for one field in disjunction are collected to $in"""
+    result: List[Any] = []
+    values_by_field: Dict[str, list] = {}
+    for branch in branches:
+        if len(branch) == 1 and "$or" in branch:
+            branches.extend(branch["$or"])
+            continue
+        equality = _equality_values(branch)
+        if equality is None:
+            result.append(branch)
+            continue
+        field, values = equality
+        if field not in values_by_field:
+            values_by_field[field] = []
+            result.append((field, branch))
+        values_by_field[field].append(values)
+    optimized = []
+    for branch in result:
+        if isinstance(branch, tuple):
+            field, first_branch = branch
+            values = values_by_field[field]
+            if len(values) == 1:
+                branch = first_branch
+            else:
+                branch = {field: {"$in": [v for vs in values for v in vs]}}
+        optimized.append(branch)
+    if len(optimized) == 1:
+        return optimized[0]
+    return {"$or": optimized}
 
-    def prepare_combination(
-        self, combination: "QCombination"
-    ) -> Union["QCombination", dict]:
-        if combination.operation == combination.AND:
-            # The simplification only applies to 'simple' queries
-            if all(isinstance(node, Q) for node in combination.children):
-                queries = [n.query for n in combination.children]
-                query = self._query_conjunction(queries)
-                return {"$and": query}
 
-        return combination
+def _conjunction(query: dict) -> List[dict]:
+    if len(query) == 1 and "$and" in query:
+        return query["$and"]
+    return [query]
 
-    def _query_conjunction(self, queries):
-        """Merges query dicts - effectively &ing them together."""
-        combined_query = []
-        for query in queries:
-            query = _validate_query_data(self.builder, query)
-            combined_query.append(copy.deepcopy(query))
-        return combined_query
 
+def optimize_query(query: dict, collation: Optional[Collation] = None) -> dict:
+    """rewrite compiled query to equivalent planner friendly filter
 
-class QCompilerVisitor(QNodeVisitor):
-    """Compiles the nodes in a query tree to a PyMongo-compatible query
-    dictionary.
-    """
+    - equalities of one field in $or become $in
+    - $and and nested $and are flattened into one document for disjoint keys
+    - operators for one field are merged, same direction bounds are tightened,
+      string bounds only without collation
 
-    def __init__(self, builder: "Builder"):
-        self.builder = builder
+    Input is never mutated, untouched sub-queries are shared with it.
+    """
+    conditions: List[dict] = []
+    for key, value in query.items():
+        if key == "$and":
+            for v in value:
+                conditions.extend(_conjunction(optimize_query(v, collation)))
+        elif key == "$or":
+            or_query = _optimize_or([optimize_query(v, collation) for v in value])
+            conditions.extend(_conjunction(or_query))
+        else:
+            conditions.append({key: value})
+    if not conditions:
+        return query
+    return _optimize_and(conditions, collation)
 
-    def prepare_combination(
-        self, combination: "QCombination"
-    ) -> Union["QCombination", dict]:
-        operator = "$and"
-        if combination.operation == combination.OR:
-            operator = "$or"
-        return {operator: combination.children}
 
-    def visit_query(self, query: "Q") -> Union["Q", dict]:
-        data = _validate_query_data(self.builder, query.query)
-        return data
+class QNode(object):
+    """Base class for nodes in query trees.
 
+    Nodes are immutable: compiled query is cached on node per Document class
+    and reused, so one Q object can be passed to any number of queries.
+    Combinations are built from cached queries of their children.
+    """
 
-class QNode(object):
-    """Base class for nodes in query trees."""
+    __slots__ = ("_compiled", "_written")
 
     AND = 0
     OR = 1
 
+    def __init__(self):
+        # Document class -> optimized query
+        self._compiled: Dict[Any, dict] = {}
+        # Document class -> query as written
+        self._written: Dict[Any, dict] = {}
+
     def to_query(self, builder: "Builder") -> dict:
-        query = self.accept(SimplificationVisitor(builder))
-        if not isinstance(query, dict):
-            query = query.accept(QCompilerVisitor(builder))
+        """compiled pymongo query, result is shared and must not be mutated"""
+        document = builder.odm_manager.document
+        query = self._compiled.get(document)
+        if query is None:
+            compiled = self.compile(builder)
+            query = self._compiled[document] = optimize_query(
+                compiled, document.__collation__
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("query %s optimized to %s", compiled, query)
         return query
 
-    def accept(self, visitor):
+    def explain(self, builder: "Builder") -> dict:
+        """query as written and query after optimization, for debugging"""
+        return {"query": self.compile(builder), "optimized": self.to_query(builder)}
+
+    def compile(self, builder: "Builder") -> dict:
+        """query as written, without optimization, cached like to_query"""
+        document = builder.odm_manager.document
+        query = self._written.get(document)
+        if query is None:
+            query = self._written[document] = self._compile(builder)
+        return query
+
+    def _compile(self, builder: "Builder") -> dict:
         raise NotImplementedError
 
     def _combine(self, other, operation):
@@ -138,16 +285,20 @@ class QNode(object):
 
 
 class QCombination(QNode):
+    __slots__ = ("operation", "children")
+
     def __init__(self, operation, children):
+        super().__init__()
         self.operation = operation
-        self.children = []
+        merged: List[QNode] = []
         for node in children:
             # If the child is a combination of the same type, we can merge its
             # children directly into this combinations children
             if isinstance(node, QCombination) and node.operation == operation:
-                self.children += node.children
+                merged += node.children
             else:
-                self.children.append(node)
+                merged.append(node)
+        self.children: Tuple[QNode, ...] = tuple(merged)
 
     def __repr__(self):
         op = " & " if self.operation is self.AND else " | "
@@ -156,12 +307,9 @@ class QCombination(QNode):
     def __bool__(self):
         return bool(self.children)
 
-    def accept(self, visitor) -> Union["QCombination", dict]:
-        for i in range(len(self.children)):
-            if isinstance(self.children[i], QNode):
-                self.children[i] = self.children[i].accept(visitor)
-
-        return visitor.prepare_combination(self)
+    def _compile(self, builder: "Builder") -> dict:
+        operator = "$or" if self.operation == self.OR else "$and"
+        return {operator: [node.compile(builder) for node in self.children]}
 
     @property
     def empty(self):
@@ -180,7 +328,10 @@ class Q(QNode):
     query structures.
     """
 
+    __slots__ = ("query",)
+
     def __init__(self, **query):
+        super().__init__()
         self.query = query
 
     def __repr__(self):
@@ -192,8 +343,8 @@ class Q(QNode):
     def __eq__(self, other):
         return self.__class__ == other.__class__ and self.query == other.query
 
-    def accept(self, visit: "QNodeVisitor") -> Union["Q", dict]:
-        return visit.visit_query(self)
+    def _compile(self, builder: "Builder") -> dict:
+        return _validate_query_data(builder, self.query)
 
     @property
     def empty(self) -> bool:
@@ -278,36 +429,102 @@ class SimpleAggregateResult(object):
         return self._data
 
 
+class QueryFieldPlan(object):
+    """compiled handling of one ``field__inner__extra`` query key"""
+
+    __slots__ = (
+        "query_field",
+        "field",
+        "target_field",
+        "operator",
+        "validator",
+        "merge",
+    )
+
+    def __init__(
+        self,
+        query_field: str,
+        field: str,
+        target_field: str,
+        operator: Optional[Callable[[Any], dict]],
+        validator: Optional[Callable[[Any], Any]],
+        merge: bool,
+    ):
+        self.query_field = query_field
+        self.field = field
+        self.target_field = target_field
+        self.operator = operator
+        self.validator = validator
+        self.merge = merge
+
+
+class QueryPlan(object):
+    """compiled generate_basic_query for one tuple of query keys
+
+    Splitting keys, extra params parsing and field validation run once on
+    compile, bind only converts values.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: Tuple[QueryFieldPlan, ...]):
+        self.fields = fields
+
+    @classmethod
+    def compile(
+        cls,
+        manager: "ODMManager",
+        query_fields: Tuple[str, ...],
+        with_validate_document_fields: bool = True,
+    ) -> "QueryPlan":
+        document = manager.document
+        fields = []
+        for query_field in query_fields:
+            field, *extra_params = query_field.split("__")
+            inners, extra_params = manager._parse_extra_params(extra_params)
+            if with_validate_document_fields and not manager._validate_field(field):
+                continue
+            operator, validator = None, None
+            if extra_params:
+                mapper = ExtraQueryMapper(document, field)
+                operator = mapper.compile(extra_params)
+            elif field == "_id":
+                validator = ObjectId
+            elif not inners:
+                validator = get_field_validator(document, field)
+            target_field = field
+            if inners:
+                target_field = f'{field}.{".".join(i for i in inners)}'
+            merge = bool(extra_params) and (
+                "__gt" in query_field or "__lt" in query_field
+            )
+            fields.append(
+                QueryFieldPlan(
+                    query_field, field, target_field, operator, validator, merge
+                )
+            )
+        return cls(tuple(fields))
+
+    def bind(self, query: dict) -> dict:
+        query_params: dict = {}
+        for plan in self.fields:
+            value = query[plan.query_field]
+            if plan.operator is not None:
+                extra = plan.operator(value)
+                value = extra[plan.field]
+            elif plan.validator is not None:
+                value = plan.validator(value)
+            target_field = plan.target_field
+            if plan.merge and target_field in query_params:
+                query_params[target_field].update(value)
+            else:
+                query_params[target_field] = value
+        return query_params
+
+
 def generate_basic_query(
     manager: "ODMManager",
     query: dict,
     with_validate_document_fields: bool = True,
 ) -> dict:
-    query_params: dict = {}
-    for query_field, value in query.items():
-        field, *extra_params = query_field.split("__")
-        inners, extra_params = manager._parse_extra_params(extra_params)
-        if with_validate_document_fields and not manager._validate_field(field):
-            continue
-        extra = ExtraQueryMapper(manager.document, field).query(extra_params, value)
-        if extra:
-            value = extra[field]
-        elif field == "_id":
-            value = ObjectId(value)
-        else:
-            value = (
-                validate_field_value(manager.document, field, value)
-                if not inners
-                else value
-            )
-        if inners:
-            field = f'{field}.{".".join(i for i in inners)}'
-        if (
-            extra
-            and field in query_params
-            and ("__gt" in query_field or "__lt" in query_field)
-        ):
-            query_params[field].update(value)
-        else:
-            query_params[field] = value
-    return query_params
+    return manager.query_plan(tuple(query), with_validate_document_fields).bind(query)
@@ -1,4 +1,19 @@
-from typing import List, Generator, Any, Union, Tuple, TYPE_CHECKING
+from functools import partial
+from typing import (
+    List,
+    Dict,
+    Generator,
+    Any,
+    Optional,
+    Union,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from bson import decode as bson_decode
+from bson.raw_bson import RawBSONDocument
+
+from ..columns import ColumnBuilder
 
 
 if TYPE_CHECKING:
@@ -63,6 +78,85 @@ class FindResult(object):
     def serialize_json(self, fields: Union[Tuple, List]) -> str:
         return self.document_class.__encoder__.encode(self.serialize(fields)).decode()
 
+    def to_columns(
+        self, fields: Union[Tuple, List], dictionary_encode: bool = False
+    ) -> Dict[str, Any]:
+        """numpy arrays per field, types are taken from Document annotations
+
+        Args:
+            fields (Union[Tuple, List]): document fields
+            dictionary_encode (bool, optional): str fields as DictionaryColumn. Defaults to False.
+
+        Returns:
+            Dict[str, Any]: field -> numpy array | DictionaryColumn
+        """
+        builder = ColumnBuilder(self.document_class, fields, dictionary_encode)
+        for obj in self.__iter__():
+            builder.append(partial(getattr, obj))
+        return builder.build()
+
+
+class PageResult(FindResult):
+    """one page of keyset pagination, next_token is None for last page"""
+
+    __slots__ = ('next_token',)
+
+    def __init__(
+        self,
+        document_class: 'Document',
+        data: list,
+        next_token: Optional[str] = None,
+    ):
+        super().__init__(document_class, data)
+        self.next_token = next_token
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_token is not None
+
+
+class RawFindResult(object):
+    """find result with undecoded rows, decoding happens only when asked"""
+
+    __slots__ = ('_data', 'document_class')
+
+    def __init__(
+        self,
+        document_class: 'Document',
+        data: List[RawBSONDocument],
+    ):
+        self._data = data
+        self.document_class = document_class
+
+    def __iter__(self):
+        for obj in self._data:
+            yield obj
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def raw(self) -> List[bytes]:
+        return [obj.raw for obj in self._data]
+
+    @property
+    def data(self) -> List[dict]:
+        return [bson_decode(obj.raw) for obj in self._data]
+
+    @property
+    def documents(self) -> List['Document']:
+        from_bson = self.document_class.from_bson
+        return [from_bson(obj) for obj in self._data]
+
+    def json(self) -> str:
+        return self.document_class.__encoder__.encode(self.data).decode()
+
+    def first(self) -> Any:
+        return next(self.__iter__())
+
 
 class SimpleAggregateResult(object):
     __slots__ = ('_data', 'document_class')
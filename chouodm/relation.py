@@ -1,15 +1,25 @@
 import asyncio
-from typing import Optional, Any, TYPE_CHECKING, List
+from typing import (
+    Optional,
+    Any,
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Set,
+    Tuple,
+    Union,
+)
 from enum import Enum
 
 from msgspec import inspect, Struct
 
+from .errors import QueryValidationError
 from .typing import DocumentType
 from .types import Relation
 
 if TYPE_CHECKING:
     from .document import Document
-    from .typing import DictStrList
 
 
 class RelationInfoTypes(str, Enum):
@@ -24,116 +34,291 @@ class RelationInfo(Struct):
     relation_type: RelationInfoTypes
 
 
-class RelationManager(object):
-    """relation manager for get and set data from to document instances"""
+# prefetch paths as tree: relation field -> paths of related document
+PrefetchTree = Dict[str, "PrefetchTree"]  # type: ignore
 
-    __slots__ = ("document_class", "relation_fields")
 
-    def __init__(self, document_class: "Document"):
-        self.document_class = document_class
-        self.relation_fields = self._get_relation_fields(document_class)
+def _document_class(document: Any) -> DocumentType:
+    # projected documents keep their Document class
+    return getattr(type(document), "__document_class__", type(document))
 
-    @classmethod
-    def _get_relation_fields(cls, document_class: "Document") -> dict:
-        return document_class.__relation_info__ or {}
 
-    def _relation_data_setter(self, document: "Document", data: dict) -> "Document":
-        """data setter
+def parse_prefetch(
+    document_class: DocumentType, paths: Union[Tuple, List]
+) -> PrefetchTree:
+    """dotted relation paths ("author", "author.company") -> PrefetchTree
 
-        Args:
-            document (Document): document insatance
-            data (dict): relations objects map
+    Raises:
+        QueryValidationError: if path part is not relation field
+    """
+    tree: PrefetchTree = {}
+    for path in paths:
+        node, current = tree, document_class
+        for field in path.split("."):
+            relation_info = current.__relation_info__.get(field)
+            if relation_info is None:
+                raise QueryValidationError(
+                    f"{field} in prefetch path {path} is not relation field"
+                    f" of {current.__name__}"
+                )
+            node = node.setdefault(field, {})
+            current = relation_info.document_class
+    return tree
 
-        Returns:
-            Document: updated document
-        """
-        for field, relation_info in self.relation_fields.items():
-            relation_attr = getattr(document, field)
+
+class RelationLoader(object):
+    """loads relation objects for documents tree level by level
+
+    Identity map keeps every document of one load by (collection, id), so
+    documents referenced from many documents and levels are fetched once.
+    Missing documents of one class are fetched with one query per level,
+    round trips are bounded by relation depth, not by fan-out.
+
+    Only relations from prefetch tree are loaded if it is set, others stay
+    Relation handles. Relations of documents max_depth levels below loaded
+    documents stay Relation handles too, as relations which would make
+    cycle of loaded objects (A -> B -> A), so they can be serialized.
+    """
+
+    __slots__ = ("identity_map", "queries", "prefetch", "max_depth")
+
+    def __init__(
+        self,
+        prefetch: Optional[PrefetchTree] = None,
+        max_depth: Optional[int] = None,
+    ):
+        if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 0):
+            raise ValueError("max_depth must be positive int or 0")
+        self.identity_map: Dict[Tuple[str, str], "Document"] = {}
+        # find queries made, for tests and debugging
+        self.queries = 0
+        self.prefetch = prefetch
+        self.max_depth = max_depth
+
+    @staticmethod
+    def _key(document_class: DocumentType, object_id: Any) -> Tuple[str, str]:
+        return document_class.get_collection_name(), str(object_id)
+
+    @staticmethod
+    def _relations(document: "Document", field: str) -> Iterator[Relation]:
+        # projected documents may not have all relation fields
+        relation_attr = getattr(document, field, None)
+        if not relation_attr:
+            return
+        if not isinstance(relation_attr, list):
+            relation_attr = (relation_attr,)
+        for relation in relation_attr:
+            if isinstance(relation, Relation):
+                yield relation
+
+    def _missing_ids(
+        self, level: List[Tuple["Document", List[str]]]
+    ) -> Dict[DocumentType, set]:
+        missing: Dict[DocumentType, set] = {}
+        for document, fields in level:
+            relation_info = document.__relation_info__
+            for field in fields:
+                document_class = relation_info[field].document_class
+                for relation in self._relations(document, field):
+                    object_id = relation.db_ref.id
+                    if self._key(document_class, object_id) not in self.identity_map:
+                        missing.setdefault(document_class, set()).add(object_id)
+        return missing
+
+    async def _fetch(self, document_class: DocumentType, ids: set) -> list:
+        self.queries += 1
+        result = await document_class.Q().find(_id__in=list(ids))
+        return list(result)
+
+    @staticmethod
+    def _reaches(
+        start: "Document", target: "Document", children: Dict[int, List[Any]]
+    ) -> bool:
+        # walks relation objects already set by this load
+        stack, visited = [start], set()
+        while stack:
+            document = stack.pop()
+            if document is target:
+                return True
+            if id(document) in visited:
+                continue
+            visited.add(id(document))
+            stack.extend(children.get(id(document), ()))
+        return False
+
+    def _related(
+        self,
+        document: "Document",
+        document_class: DocumentType,
+        relation: Relation,
+        children: Dict[int, List[Any]],
+    ) -> Any:
+        """loaded object for relation, handle if object would contain document"""
+        obj = self.identity_map.get(self._key(document_class, relation.db_ref.id))
+        if obj is None:
+            return None
+        # documents without relations cant lead back to document
+        if obj.__relation_info__ and self._reaches(obj, document, children):
+            return relation
+        children.setdefault(id(document), []).append(obj)
+        return obj
+
+    def _set_relations(
+        self,
+        document: "Document",
+        fields: Set[str],
+        children: Dict[int, List[Any]],
+    ) -> None:
+        relation_info = document.__relation_info__
+        for field in fields:
+            relation_attr = getattr(document, field, None)
             if not relation_attr:
                 continue
-            if relation_info.relation_type == RelationInfoTypes.ARRAY:
-                relation_value = []
-                for rel in relation_attr:
-                    v = data[field].get(rel.db_ref.id)
+            document_class = relation_info[field].document_class
+            if relation_info[field].relation_type == RelationInfoTypes.ARRAY:
+                relation_value: Any = []
+                for relation in relation_attr:
+                    if not isinstance(relation, Relation):
+                        relation_value.append(relation)
+                        continue
+                    v = self._related(document, document_class, relation, children)
                     if v:
                         relation_value.append(v)
+            elif isinstance(relation_attr, Relation):
+                relation_value = self._related(
+                    document, document_class, relation_attr, children
+                )
             else:
-                relation_value = data[field].get(relation_attr.db_ref.id)
+                continue
             setattr(document, field, relation_value)
-        return document
 
-    async def _get_relation_objects_by_document_class(
+    def _expand(
         self,
-        field: str,
-        document_class: DocumentType,
-        ids: list,
-    ) -> dict:
-        result = await document_class.Q().find(_id__in=ids, with_relations_objects=True)
-        return {field: {str(o._id): o for o in result}}
-
-    async def get_relation_objects(self, pre_relation: "DictStrList") -> dict:
-        futures = []
-        for field, ids in pre_relation.items():
-            document_class = self.relation_fields[field].document_class
-            futures.append(
-                asyncio.ensure_future(
-                    self._get_relation_objects_by_document_class(
-                        field, document_class, ids
-                    )
+        nodes: List[Tuple["Document", Optional[PrefetchTree], int]],
+        seen: Set[Tuple[int, int]],
+    ) -> List[Tuple["Document", Optional[PrefetchTree], int, List[str]]]:
+        """documents with relation fields to load on this level"""
+        expanded = []
+        for document, tree, depth in nodes:
+            relation_info = document.__relation_info__
+            if not relation_info:
+                continue
+            if self.max_depth is not None and depth >= self.max_depth:
+                continue
+            # same document is reached by many paths, expand it once per subtree
+            key = (id(document), id(tree))
+            if key in seen:
+                continue
+            seen.add(key)
+            if tree is None:
+                fields = list(relation_info)
+            else:
+                fields = [f for f in tree if f in relation_info]
+            if fields:
+                expanded.append((document, tree, depth, fields))
+        return expanded
+
+    async def load(self, documents: List["Document"]) -> List["Document"]:
+        """replace relations of documents and of loaded relation objects"""
+        for document in documents:
+            if getattr(document, "_id", None) is not None:
+                key = self._key(_document_class(document), document._id)
+                self.identity_map.setdefault(key, document)
+        seen: Set[Tuple[int, int]] = set()
+        # id(document) -> (document, relation fields to set)
+        loaded: Dict[int, Tuple["Document", Set[str]]] = {}
+        level = self._expand([(d, self.prefetch, 0) for d in documents], seen)
+        while level:
+            missing = self._missing_ids([(d, fields) for d, _, _, fields in level])
+            if missing:
+                classes = list(missing)
+                results = await asyncio.gather(
+                    *[self._fetch(c, missing[c]) for c in classes]
                 )
-            )
+                for document_class, result in zip(classes, results):
+                    for document in result:
+                        key = self._key(document_class, document._id)
+                        self.identity_map.setdefault(key, document)
+            nodes = []
+            for document, tree, depth, fields in level:
+                loaded.setdefault(id(document), (document, set()))[1].update(fields)
+                relation_info = document.__relation_info__
+                for field in fields:
+                    document_class = relation_info[field].document_class
+                    subtree = None if tree is None else tree[field]
+                    for relation in self._relations(document, field):
+                        target = self.identity_map.get(
+                            self._key(document_class, relation.db_ref.id)
+                        )
+                        if target is not None:
+                            nodes.append((target, subtree, depth + 1))
+            level = self._expand(nodes, seen)
+        # documents are set in load order, relation back to ancestor on the
+        # path stays Relation handle, so loaded objects never contain themselves
+        children: Dict[int, List[Any]] = {}
+        for document, fields in loaded.values():
+            self._set_relations(document, fields, children)
+        return documents
+
+
+class RelationManager(object):
+    """relation manager for get and set data from to document instances"""
+
+    __slots__ = ("document_class", "relation_fields")
+
+    def __init__(self, document_class: "Document"):
+        self.document_class = document_class
+        self.relation_fields = self._get_relation_fields(document_class)
 
-        relation_objects = {}
-        for _, field_relation_result in enumerate(
-            asyncio.as_completed(futures), start=1
-        ):
-            relation_objects.update(await field_relation_result)
-        return relation_objects
-
-    def _get_pre_relation(self, document_instances: List["Document"]) -> "DictStrList":
-        pre_relation: "DictStrList" = {field: [] for field in self.relation_fields}
-        for document_instance in document_instances:
-            for field in self.relation_fields:
-                attr = getattr(document_instance, field)
-                if isinstance(attr, list):
-                    ids = tuple(row.db_ref.id for row in attr)
-                else:
-                    ids = (attr.db_ref.id,) if attr else tuple()
-                if ids:
-                    pre_relation[field].extend(ids)
-        return {f: list(set(items)) for f, items in pre_relation.items()}
+    @classmethod
+    def _get_relation_fields(cls, document_class: "Document") -> dict:
+        return document_class.__relation_info__ or {}
+
+    def get_loader(
+        self,
+        prefetch: Union[Tuple, List, None] = None,
+        max_depth: Optional[int] = None,
+    ) -> RelationLoader:
+        """loader for one find call, prefetch paths are validated here"""
+        tree = parse_prefetch(self.document_class, prefetch) if prefetch else None
+        return RelationLoader(tree, max_depth)
 
     async def map_relation_for_single(
-        self, document_instance: "Document"
+        self,
+        document_instance: "Document",
+        prefetch: Union[Tuple, List, None] = None,
+        max_depth: Optional[int] = None,
     ) -> "Document":
         """map relation data to mongo model instanc
 
         Args:
             document_instance (Document): list of instances from Document
+            prefetch (Union[Tuple, List, None], optional): relation paths to load, all if empty. Defaults to None.
+            max_depth (Optional[int], optional): relation levels to load. Defaults to None.
 
         Returns:
             Document: mapped document
         """
-        pre_relation: "DictStrList" = self._get_pre_relation([document_instance])
-        relation_objects = await self.get_relation_objects(pre_relation)
-        print(relation_objects)
-        return self._relation_data_setter(document_instance, relation_objects)
+        await self.get_loader(prefetch, max_depth).load([document_instance])
+        return document_instance
 
-    async def map_relation_for_array(self, result: List) -> List["Document"]:
+    async def map_relation_for_array(
+        self,
+        result: List,
+        prefetch: Union[Tuple, List, None] = None,
+        max_depth: Optional[int] = None,
+    ) -> List["Document"]:
         """map relations data for _find method list result
 
         Args:
             result (List): _find query result converted to list
+            prefetch (Union[Tuple, List, None], optional): relation paths to load, all if empty. Defaults to None.
+            max_depth (Optional[int], optional): relation levels to load. Defaults to None.
 
         Returns:
             List[Document]: mapped list
         """
-        pre_relation: "DictStrList" = self._get_pre_relation(result)
-        relation_objects = await self.get_relation_objects(pre_relation)
-        generated_result = [
-            self._relation_data_setter(r, relation_objects) for r in result
-        ]
-        return generated_result
+        return await self.get_loader(prefetch, max_depth).load(result)
 
 
 def _take_relation_info_by_union(
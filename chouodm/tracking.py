@@ -0,0 +1,113 @@
+from typing import Any, Callable, Dict, Iterable, Optional, TYPE_CHECKING
+from weakref import ref
+
+from bson.raw_bson import RawBSONDocument
+
+from .lazy import inflate_raw
+
+if TYPE_CHECKING:
+    from .document import Document
+
+__all__ = (
+    "Snapshot",
+    "track",
+    "untrack",
+    "get_snapshot",
+    "changed_values",
+    "mark_saved",
+)
+
+
+class Snapshot(ref):
+    """database state of loaded document, weak reference to document itself
+
+    Raw bson bytes returned by cursor are kept as is (no copy), field values
+    are decoded only when compared. Values written by save are kept in
+    overrides.
+    """
+
+    # attributes are set by track(), ref subclass without python __init__ is
+    # much cheaper to create and from_bson creates one per document
+    __slots__ = ("key", "raw", "overrides", "_raw_document")
+
+    def get(self, field: str, default: Any = None) -> Any:
+        if self.overrides is not None and field in self.overrides:
+            return self.overrides[field]
+        if self._raw_document is None:
+            self._raw_document = RawBSONDocument(self.raw)
+        if field not in self._raw_document:
+            return default
+        return inflate_raw(self._raw_document[field])
+
+
+# id(document) -> Snapshot, entries are removed when document is collected
+_snapshots: Dict[int, Snapshot] = {}
+_MISSING = object()
+
+
+def _forget(snapshot: Snapshot) -> None:
+    if _snapshots.get(snapshot.key) is snapshot:
+        del _snapshots[snapshot.key]
+
+
+def track(document: "Document", raw: bytes) -> None:
+    snapshot = Snapshot(document, _forget)
+    snapshot.key = key = id(document)
+    snapshot.raw = raw
+    snapshot.overrides = None
+    snapshot._raw_document = None
+    _snapshots[key] = snapshot
+
+
+def untrack(document: "Document") -> None:
+    _snapshots.pop(id(document), None)
+
+
+def get_snapshot(document: "Document") -> Optional[Snapshot]:
+    snapshot = _snapshots.get(id(document))
+    if snapshot is None or snapshot() is not document:
+        return None
+    return snapshot
+
+
+def _same(first: Any, second: Any) -> bool:
+    """equality which also checks types: 1 != 1.0 != True for database"""
+    if isinstance(first, (list, tuple)) and isinstance(second, (list, tuple)):
+        return len(first) == len(second) and all(
+            _same(f, s) for f, s in zip(first, second)
+        )
+    if isinstance(first, dict) and isinstance(second, dict):
+        return first.keys() == second.keys() and all(
+            _same(v, second[k]) for k, v in first.items()
+        )
+    return type(first) is type(second) and first == second
+
+
+def changed_values(
+    document: "Document",
+    fields: Iterable[str],
+    validate: Callable[[dict], dict],
+) -> Optional[Dict[str, Any]]:
+    """database values of changed fields, None if document is not tracked
+
+    validate converts values like update query does, see
+    Builder._validate_update_values
+    """
+    snapshot = get_snapshot(document)
+    if snapshot is None:
+        return None
+    validated = validate({field: getattr(document, field) for field in fields})
+    changed = {}
+    for field, value in validated.items():
+        if not _same(value, snapshot.get(field, _MISSING)):
+            changed[field] = value
+    return changed
+
+
+def mark_saved(document: "Document", values: Dict[str, Any]) -> None:
+    """values from changed_values were written to database"""
+    snapshot = get_snapshot(document)
+    if snapshot is not None:
+        if snapshot.overrides is None:
+            snapshot.overrides = {}
+        snapshot.overrides.update(values)
@@ -23,7 +23,7 @@ class Relation(Generic[T]):
         self.document_class = document_class
 
     async def get(self) -> Optional["Document"]:
-        result = await self.document_class.Q().find_one(_id=self.db_ref.id, with_relations_objects=True)  # type: ignore
+        result = await self.document_class.Q().get_by_id(self.db_ref.id, with_relations_objects=True)  # type: ignore
         return result
 
     @classmethod
@@ -1,7 +1,66 @@
-from typing import Union, List, Tuple, Generator
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Hashable,
+    Iterable,
+    Union,
+    List,
+    Tuple,
+    Generator,
+)
 
 
 def chunk_by_length(items: Union[List, Tuple], step: int) -> Generator:
     """Yield successive n-sized chunks from l."""
     for i in range(0, len(items), step):
         yield items[i : i + step]
+
+
+class LRUCache(object):
+    """small OrderedDict based LRU cache"""
+
+    __slots__ = ("maxsize", "_data")
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+async def aenumerate(
+    items: Union[Iterable, AsyncIterable], start: int = 0
+) -> AsyncGenerator[Tuple[int, Any], None]:
+    """enumerate for both sync and async iterables"""
+    index = start
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield index, item
+            index += 1
+    else:
+        for item in items:
+            yield index, item
+            index += 1
@@ -1,4 +1,12 @@
-from typing import Any, Union, Optional, Tuple, TYPE_CHECKING
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Union,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 from uuid import UUID
 from collections.abc import Collection
 
@@ -14,22 +22,10 @@ if TYPE_CHECKING:
     from .typing import DocumentType
 
 
-def validate_field_value(
+def _validate_field_value(
     document: Union["Document", "DocumentType"], name: str, value: Any
 ) -> Any:
-    """field value validtion
-
-    Args:
-        document (Union[Document, DocumentType]): document
-        name (str): field name
-        value (Any): field value
-    Raises:
-        AttributeError: if not field in fields
-        QueryValidationError: if invalid value type
-
-    Returns:
-        Any: validated value
-    """
+    """generic field value validation, used when validator cant be compiled"""
     if name == "_id":
         field_type = ObjectId
     else:
@@ -73,6 +69,131 @@ def validate_field_value(
         raise QueryValidationError(f"field - {name}, native error - {e}")
 
 
+class FieldValidator(object):
+    """validate_field_value compiled once for one document field
+
+    Annotation lookup and origin introspection are done on compile, only value
+    checks are left for call. Unusual annotations fall back to the generic
+    implementation so results and errors stay the same.
+    """
+
+    __slots__ = (
+        "document",
+        "name",
+        "field_type",
+        "relation_class",
+        "fallback",
+        "exact_type",
+    )
+
+    def __init__(self, document: Union["Document", "DocumentType"], name: str):
+        self.document = document
+        self.name = name
+        self.field_type = (
+            ObjectId if name == "_id" else document.__annotations__.get(name)
+        )
+        self.relation_class: Optional["DocumentType"] = None
+        self.fallback = False
+        self.exact_type = False
+        try:
+            self._compile()
+        except (TypeError, KeyError, AttributeError):
+            self.fallback = True
+
+    def _compile(self) -> None:
+        field_type = self.field_type
+        if not field_type:
+            raise AttributeError(f"invalid field - {self.name}")
+        origin = getattr(field_type, "__origin__", None)
+        if origin == list or origin == Union:
+            args = getattr(field_type, "__args__", ())
+            if args:
+                origin = getattr(args[0], "__origin__", None)
+        if origin and issubclass(origin, Relation):
+            self.relation_class = self.document.__relation_info__[
+                self.name
+            ].document_class
+            return
+        self.exact_type = isinstance(field_type, type) and not issubclass(
+            field_type, (UUID, Struct)
+        )
+
+    def __call__(self, value: Any) -> Any:
+        if self.fallback:
+            return _validate_field_value(self.document, self.name, value)
+        relation_class = self.relation_class
+        if relation_class is not None:
+            if isinstance(value, list):
+                return [
+                    Relation.validate(v, relation_class).to_db_ref() for v in value
+                ]
+            return (
+                Relation.validate(value, relation_class).to_db_ref() if value else None
+            )
+        field_type = self.field_type
+        if isinstance(value, UUID):
+            return str(value)
+        elif isinstance(value, Struct):
+            return structs.asdict(value)
+        elif isinstance(value, field_type):
+            return value
+        elif field_type == str and isinstance(value, Collection):
+            raise QueryValidationError(
+                f"field - {self.name} for field_type: {field_type}"
+            )
+        try:
+            converted_value = field_type(value)
+            return converted_value
+        except (TypeError, ValueError) as e:
+            raise QueryValidationError(f"field - {self.name}, native error - {e}")
+
+    def many(self, values: Iterable) -> list:
+        """validate list of values ($in, $nin), same result as calling per value"""
+        values = list(values)
+        if self.exact_type:
+            field_type = self.field_type
+            if all(type(v) is field_type for v in values):
+                return values
+        return [self(v) for v in values]
+
+
+def compile_field_validators(
+    document: Union["Document", "DocumentType"]
+) -> Dict[str, FieldValidator]:
+    """validators for all annotated fields of document"""
+    names = ["_id", *document.__annotations__]
+    return {name: FieldValidator(document, name) for name in names}
+
+
+def get_field_validator(
+    document: Union["Document", "DocumentType"], name: str
+) -> FieldValidator:
+    validator = getattr(document, "__validators__", {}).get(name)
+    if validator is None:
+        # not annotated field, call raises the same errors as before
+        return FieldValidator(document, name)
+    return validator
+
+
+def validate_field_value(
+    document: Union["Document", "DocumentType"], name: str, value: Any
+) -> Any:
+    """field value validtion
+
+    Args:
+        document (Union[Document, DocumentType]): document
+        name (str): field name
+        value (Any): field value
+    Raises:
+        AttributeError: if not field in fields
+        QueryValidationError: if invalid value type
+
+    Returns:
+        Any: validated value
+    """
+    return get_field_validator(document, name)(value)
+
+
 def sort_validation(
     sort: Optional[int] = None, sort_fields: Union[list, tuple, None] = None
 ) -> Tuple[Any, ...]:
@@ -18,7 +18,7 @@ async def drop_ticket_collection(event_loop):
 
 def test_query_organization(connection):
     query = Q(name=123) | Q(name__ne=124) & Q(position=1) | Q(position=2)
-    data = query.to_query(TicketForQuery.manager.querybuilder())
+    data = query.explain(TicketForQuery.manager.querybuilder())
     value = {
         "$or": [
             {"name": "123"},
@@ -26,7 +26,31 @@ def test_query_organization(connection):
             {"position": 2},
         ]
     }
-    assert data == value
+    assert data["query"] == value
+    optimized = {
+        "$or": [
+            {"name": "123"},
+            {"name": {"$ne": "124"}, "position": 1},
+            {"position": 2},
+        ]
+    }
+    assert data["optimized"] == optimized
+    assert query.to_query(TicketForQuery.manager.querybuilder()) == optimized
+
+
+def test_query_reuse(connection):
+    first = Q(name=123)
+    query = first | Q(name__ne=124) & Q(position=1)
+    data = query.to_query(TicketForQuery.manager.querybuilder())
+    assert query.to_query(TicketForQuery.manager.querybuilder()) is data
+    assert first.to_query(TicketForQuery.manager.querybuilder()) == {"name": "123"}
+    assert query.children[0] is first
+    assert first.query == {"name": 123}
+    # new combination is built from cached queries of children
+    builder = TicketForQuery.manager.querybuilder()
+    combined = first & Q(position=2)
+    assert combined.compile(builder)["$and"][0] is first.compile(builder)
+    assert not hasattr(query, "__dict__")
 
 
 @pytest.mark.asyncio
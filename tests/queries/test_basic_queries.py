@@ -1,12 +1,20 @@
+import asyncio
 import pytest
 import pytest_asyncio
 
-from bson import ObjectId
+from bson import ObjectId, decode_all
+from bson.raw_bson import RawBSONDocument
 from msgspec import field
 
 from motor.motor_asyncio import AsyncIOMotorClientSession
+from chouodm.columns import ColumnBuilder
 from chouodm.document import Document
 from chouodm.session import Session
+from chouodm.lazy import LazyDocument
+from chouodm.projection import PartialDocument
+from chouodm.errors import InsertManyError, NotDeclaredField, QueryValidationError
+from chouodm.query import Q
+from chouodm.query.result import RawFindResult
 
 
 class Ticket(Document):
@@ -27,11 +35,27 @@ class Trash(Document):
     date: str
 
 
+class TrackedTicket(Ticket):
+    class Config:
+        collection_name = "ticket"
+        track_changes = True
+
+
+class BatchedTrash(Document):
+    name: str
+    date: str
+
+    class Config:
+        write_batch_size = 10
+        write_batch_delay = 0.01
+
+
 @pytest_asyncio.fixture(scope="session", autouse=True)
 async def drop_collection(event_loop):
     yield
     await Ticket.Q().drop_collection(force=True)
     await Trash.Q().drop_collection(force=True)
+    await BatchedTrash.Q().drop_collection(force=True)
 
 
 @pytest.mark.asyncio
@@ -71,6 +95,57 @@ async def test_insert_many(connection):
     assert inserted == 3
 
 
+@pytest.mark.asyncio
+async def test_insert_many_stream(connection):
+    async def generate():
+        for i in range(10):
+            yield {"name": f"stream-{i}", "date": "2022-01-01"}
+        yield {"name": 1, "date": "2022-01-01"}
+
+    with pytest.raises(InsertManyError) as e:
+        await Trash.Q().insert_many(generate(), chunk_size=3, concurrency=2)
+    assert e.value.inserted_count == 10
+    [error] = e.value.errors
+    assert error.offset == 10 and error.size == 1
+    assert await Trash.Q().count(date="2022-01-01") == 10
+    assert await Trash.Q().delete_many(date="2022-01-01") == 10
+
+
+@pytest.mark.asyncio
+async def test_insert_many_source_error(connection):
+    async def generate():
+        for i in range(5):
+            yield {"name": f"broken-{i}", "date": "2022-01-03"}
+        raise RuntimeError("source failed")
+
+    with pytest.raises(InsertManyError) as e:
+        await Trash.Q().insert_many(generate(), chunk_size=2, concurrency=1)
+    assert isinstance(e.value.__cause__, RuntimeError)
+    stop = e.value.errors[-1]
+    assert stop.offset == 5 and stop.size == 0
+    await asyncio.sleep(0.1)
+    # cancelled chunks are not inserted after error
+    assert await Trash.Q().count(date="2022-01-03") == e.value.inserted_count
+    await Trash.Q().delete_many(date="2022-01-03")
+
+
+@pytest.mark.asyncio
+async def test_insert_one_batched(connection):
+    trash = [BatchedTrash(name=f"batched{i}", date="2022-01-01") for i in range(25)]
+    await asyncio.gather(*[t.save() for t in trash])
+    assert all(isinstance(t._id, ObjectId) for t in trash)
+    assert len({t._id for t in trash}) == 25
+    found = await BatchedTrash.Q().find_one(_id=trash[3]._id)
+    assert found.name == "batched3"
+    trash[3].date = "2022-01-02"
+    await trash[3].save()
+    assert await BatchedTrash.Q().count(date="2022-01-02") == 1
+    metrics = BatchedTrash.Q().write_batcher.metrics
+    assert metrics.operations == 26
+    assert metrics.full_batches == 2
+    assert metrics.max_size == 10
+
+
 @pytest.mark.asyncio
 async def test_find_one(connection):
     data = await Ticket.Q().find_one(name="second")
@@ -95,6 +170,138 @@ async def test_find(connection):
     assert len(result.data) == 1
 
 
+@pytest.mark.asyncio
+async def test_find_huge_in(connection):
+    tickets = (await Ticket.Q().find(sort=1, sort_fields=["position"])).list
+    ids = [ObjectId() for _ in range(25000)] + [t._id for t in tickets] * 2
+    found = await Ticket.Q().find(_id__in=ids, sort=1, sort_fields=["position"])
+    assert [t.position for t in found] == [t.position for t in tickets]
+    found = await Ticket.Q().find(_id__in=ids, skip_rows=1, limit_rows=2)
+    assert len(found.list) == min(2, len(tickets) - 1)
+
+
+@pytest.mark.asyncio
+async def test_find_lazy(connection):
+    result = await Ticket.Q().find(name="second", lazy=True)
+    lazy_ticket = result.first()
+    assert isinstance(lazy_ticket, LazyDocument)
+    assert lazy_ticket.position == 2
+    assert "config" not in lazy_ticket._cache
+    assert lazy_ticket.position_property == 2
+    ticket = lazy_ticket.materialize()
+    assert isinstance(ticket, Ticket)
+    assert ticket.data == result.data[0]
+
+
+@pytest.mark.asyncio
+async def test_iterate(connection):
+    names = [ticket.name async for ticket in Ticket.Q().iterate(batch_size=1)]
+    assert len(names) == await Ticket.Q().count()
+    async for ticket in Ticket.Q().iterate(batch_size=1, name="second"):
+        assert ticket.name == "second"
+        break
+
+
+@pytest.mark.asyncio
+async def test_find_as_raw(connection):
+    result = await Ticket.Q().find(name="second", as_raw=True)
+    assert isinstance(result, RawFindResult)
+    assert isinstance(result.first(), RawBSONDocument)
+    assert result.data[0]["name"] == "second"
+    assert result.documents[0].position == 2
+    assert '"name":"second"' in result.json()
+    batches = [batch async for batch in Ticket.Q().iterate_raw_batches(batch_size=2)]
+    assert sum(len(decode_all(batch)) for batch in batches) == await Ticket.Q().count()
+
+
+@pytest.mark.asyncio
+async def test_find_columns(connection):
+    np = pytest.importorskip("numpy")
+    result = await Ticket.Q().find(sort_fields=("position",), sort=1)
+    columns = result.to_columns(["name", "position"])
+    assert columns["position"].dtype == np.int64
+    streamed = await Ticket.Q().find_columns(
+        ["name", "position"], sort_fields=("position",), sort=1, dictionary_encode=True
+    )
+    assert (streamed["position"] == columns["position"]).all()
+    assert list(streamed["name"].decode()) == list(columns["name"])
+
+
+def test_columns_int_field_with_double():
+    np = pytest.importorskip("numpy")
+    rows = [{"position": 1}, {"position": 2.5}, {"position": None}]
+    builder = ColumnBuilder(Ticket, ["position"])
+    for row in rows:
+        builder.append(row.get)
+    position = builder.build()["position"]
+    assert position.dtype == np.float64
+    assert list(position[:2]) == [1.0, 2.5] and np.isnan(position[2])
+    builder = ColumnBuilder(Ticket, ["position"])
+    builder.append({"position": "3"}.get)
+    assert builder.build()["position"].dtype == object
+
+
+@pytest.mark.asyncio
+async def test_find_projection(connection):
+    result = await Ticket.Q().find(name="second", only=("name", "position"))
+    ticket = result.first()
+    assert isinstance(ticket, PartialDocument)
+    assert ticket.__struct_fields__ == ("name", "position", "_id")
+    assert ticket.data["position"] == 2
+    excluded = await Ticket.Q().find_one(name="second", exclude=("config", "array"))
+    assert not hasattr(excluded, "config")
+    assert type(excluded) is type(
+        await Ticket.Q().find_one(name="second", exclude=("array", "config"))
+    )
+    with pytest.raises(NotDeclaredField):
+        await Ticket.Q().find_one(only=("invalid",))
+
+
+@pytest.mark.asyncio
+async def test_paginate(connection):
+    positions = []
+    token = None
+    while True:
+        page = await Ticket.Q().paginate(
+            sort_fields=["position"], sort=-1, after=token, limit=3
+        )
+        positions += [ticket.position for ticket in page]
+        token = page.next_token
+        if token is None:
+            break
+    assert positions == sorted(positions, reverse=True)
+    assert len(positions) == await Ticket.Q().count()
+
+    page = await Ticket.Q().paginate(Q(name="third") | Q(name="first"), limit=2)
+    assert len(page) == 2 and page.has_next
+    page = await Ticket.Q().paginate(
+        Q(name="third") | Q(name="first"), after=page.next_token, limit=2
+    )
+    assert len(page) == 1 and not page.has_next
+
+    page = await Ticket.Q().paginate(sort_fields=["position"], limit=1)
+    assert page.next_token is not None
+    with pytest.raises(QueryValidationError):
+        await Ticket.Q().paginate(sort_fields=["name"], after=page.next_token)
+    with pytest.raises(QueryValidationError):
+        await Ticket.Q().paginate(
+            sort_fields=["position"], sort=-1, after=page.next_token
+        )
+    with pytest.raises(QueryValidationError):
+        await Ticket.Q().paginate(after="x")
+    with pytest.raises(QueryValidationError):
+        await Ticket.Q().paginate(sort_fields=["array.position"])
+
+
+def test_query_plan_cache(connection):
+    plan = Ticket.manager.query_plan(("name", "position__gte"))
+    assert plan is Ticket.manager.query_plan(("name", "position__gte"))
+    assert plan.bind({"name": "second", "position__gte": "1"}) == {
+        "name": "second",
+        "position": {"$gte": 1},
+    }
+
+
 @pytest.mark.asyncio
 async def test_update_one(connection):
     updated = await Ticket.Q().update_one(name="second", config__set={"updated": 1})
@@ -111,6 +318,54 @@ async def test_update_many(connection):
     assert updated.config == {"updated": 3}
 
 
+@pytest.mark.asyncio
+async def test_update_structured(connection):
+    ticket = await Ticket.Q().find_one(name="second")
+    updated = await Ticket.Q().update_one(
+        filter=Q(name="second") & Q(_id=ticket._id),
+        set={"config.structured": True},
+        inc={"sign": 2},
+    )
+    data = await Ticket.Q().find_one(_id=ticket._id)
+    assert updated == 1
+    assert data.config["structured"] is True
+    assert data.sign == ticket.sign + 2
+    await Ticket.Q().update_one(
+        filter={"_id": ticket._id}, set={"sign": "1"}, unset=["config.structured"]
+    )
+    data = await Ticket.Q().find_one(_id=ticket._id)
+    assert data.sign == 1
+    assert "structured" not in data.config
+    with pytest.raises(NotDeclaredField):
+        await Ticket.Q().update_one(filter={"_id": ticket._id}, set={"unknown": 1})
+    with pytest.raises(QueryValidationError):
+        await Ticket.Q().update_one(filter={"_id": ticket._id})
+    # $inc values are not converted to field type
+    with pytest.raises(QueryValidationError):
+        await Ticket.Q().update_one(filter={"_id": ticket._id}, inc={"sign": 2.5})
+    with pytest.raises(QueryValidationError):
+        await Ticket.Q().update_one(filter={"_id": ticket._id}, inc={"name": 1})
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_upsert(connection):
+    tickets = (await Ticket.Q().find(name="third")).list
+    for ticket in tickets:
+        ticket.sign = 5
+    result = await Ticket.Q().bulk_update(tickets, ["sign"], chunk_size=1)
+    assert result.matched_count == len(tickets) == 2
+    assert await Ticket.Q().count(sign=5) == 2
+
+    trash = [Trash(name=f"bulk-{i}", date="2020-01-01") for i in range(3)]
+    result = await Trash.Q().bulk_upsert(trash, ["name"], chunk_size=2)
+    assert result.upserted_count == 3
+    trash[0].date = "2021-01-01"
+    result = await Trash.Q().bulk_upsert(trash, ["name"])
+    assert result.upserted_count == 0
+    assert result.modified_count == 1
+    assert await Trash.Q().count(date="2021-01-01") == 1
+
+
 @pytest.mark.asyncio
 async def test_save(connection):
     obj = await Ticket.Q().find_one(name="second")
@@ -132,6 +387,25 @@ async def test_save(connection):
     assert last_obj.position == 2
 
 
+@pytest.mark.asyncio
+async def test_save_changed_fields(connection):
+    obj = await TrackedTicket.Q().find_one(name="second")
+    await Ticket.Q().update_one(_id=obj._id, sign__set=7)
+    obj.position = 2311
+    await obj.save()
+    new_obj = await Ticket.Q().find_one(_id=obj._id)
+    assert new_obj.position == 2311
+    # not changed fields are not overwritten by stale values
+    assert new_obj.sign == 7
+
+    obj.position = 2
+    obj.sign = 1
+    await obj.save()
+    last_obj = await Ticket.Q().find_one(_id=obj._id)
+    assert last_obj.position == 2
+    assert last_obj.sign == 1
+
+
 @pytest.mark.asyncio
 async def test_queryset_serialize(connection):
     result = await Ticket.Q().find(name="second")
@@ -0,0 +1,171 @@
+import datetime
+import random
+
+from pymongo.collation import Collation
+
+from chouodm.query import optimize_query
+
+
+FIELDS = ("a", "b", "c")
+MISSING = object()
+
+
+def _equals(value, expected):
+    if isinstance(value, list):
+        return value == expected or any(
+            type(v) is type(expected) and v == expected for v in value
+        )
+    return type(value) is type(expected) and value == expected
+
+
+def _match_value(value, expected):
+    if value is MISSING:
+        return expected is None
+    return _equals(value, expected)
+
+
+def _compare(value, operator, bound):
+    values = value if isinstance(value, list) else [value]
+    checks = {
+        "$gt": lambda v: v > bound,
+        "$gte": lambda v: v >= bound,
+        "$lt": lambda v: v < bound,
+        "$lte": lambda v: v <= bound,
+    }
+    return any(isinstance(v, int) and checks[operator](v) for v in values)
+
+
+def _match_operator(value, operator, operand):
+    if operator == "$eq":
+        return _match_value(value, operand)
+    if operator == "$ne":
+        return not _match_value(value, operand)
+    if operator == "$in":
+        return any(_match_value(value, v) for v in operand)
+    if operator == "$nin":
+        return not any(_match_value(value, v) for v in operand)
+    if value is MISSING:
+        return False
+    return _compare(value, operator, operand)
+
+
+def matches(document: dict, query: dict) -> bool:
+    """small subset of mongodb filter semantics"""
+    for key, expected in query.items():
+        if key == "$and":
+            if not all(matches(document, q) for q in expected):
+                return False
+        elif key == "$or":
+            if not any(matches(document, q) for q in expected):
+                return False
+        else:
+            value = document.get(key, MISSING)
+            if isinstance(expected, dict):
+                if not all(
+                    _match_operator(value, op, v) for op, v in expected.items()
+                ):
+                    return False
+            elif not _match_value(value, expected):
+                return False
+    return True
+
+
+def random_value(rnd):
+    return rnd.choice([None, 0, 1, 2, 3, 4])
+
+
+def random_condition(rnd):
+    field = rnd.choice(FIELDS)
+    kind = rnd.random()
+    if kind < 0.4:
+        return {field: random_value(rnd)}
+    if kind < 0.5:
+        return {field: {"$in": [random_value(rnd) for _ in range(2)]}}
+    operators = rnd.sample(["$gt", "$gte", "$lt", "$lte", "$ne", "$nin"], 2)
+    return {
+        field: {
+            op: [rnd.randint(0, 4)] if op == "$nin" else rnd.randint(0, 4)
+            for op in operators
+        }
+    }
+
+
+def random_query(rnd, depth=0):
+    if depth > 2 or rnd.random() < 0.3:
+        query = {}
+        for _ in range(rnd.randint(1, 2)):
+            query.update(random_condition(rnd))
+        return query
+    operator = rnd.choice(["$and", "$or"])
+    return {operator: [random_query(rnd, depth + 1) for _ in range(rnd.randint(1, 4))]}
+
+
+def random_document(rnd):
+    document = {}
+    for field in FIELDS:
+        kind = rnd.random()
+        if kind < 0.2:
+            continue
+        if kind < 0.4:
+            document[field] = [rnd.randint(0, 4) for _ in range(rnd.randint(0, 3))]
+        else:
+            document[field] = random_value(rnd)
+    return document
+
+
+def test_or_equalities_to_in():
+    query = {"$or": [{"a": 1}, {"a": 2}, {"b": 1}, {"a": {"$in": [3]}}]}
+    assert optimize_query(query) == {"$or": [{"a": {"$in": [1, 2, 3]}}, {"b": 1}]}
+    assert optimize_query({"$or": [{"a": 1}, {"a": 2}]}) == {"a": {"$in": [1, 2]}}
+
+
+def test_and_flatten_and_merge_ranges():
+    query = {
+        "$and": [
+            {"a": 1},
+            {"$and": [{"b": {"$gte": 1}}, {"b": {"$lt": 5}}]},
+            {"b": {"$gte": 2}},
+            {"c": {"$in": [1]}},
+            {"c": {"$in": [2]}},
+        ]
+    }
+    assert optimize_query(query) == {
+        "$and": [
+            {"a": 1, "b": {"$gte": 2, "$lt": 5}, "c": {"$in": [1]}},
+            {"c": {"$in": [2]}},
+        ]
+    }
+
+
+def test_optimize_does_not_mutate():
+    branch = {"a": {"$gt": 1}}
+    query = {"$and": [branch, {"a": {"$gt": 2}}]}
+    assert optimize_query(query) == {"a": {"$gt": 2}}
+    assert query == {"$and": [{"a": {"$gt": 1}}, {"a": {"$gt": 2}}]}
+    assert branch == {"a": {"$gt": 1}}
+
+
+def test_merge_not_comparable_bounds():
+    naive = datetime.datetime(2020, 1, 1)
+    aware = datetime.datetime(2020, 1, 2, tzinfo=datetime.timezone.utc)
+    query = {"$and": [{"a": {"$gt": naive}}, {"a": {"$gt": aware}}]}
+    assert optimize_query(query) == query
+    query = {"$and": [{"a": {"$lt": "b"}}, {"a": {"$lt": "B"}}]}
+    assert optimize_query(query) == {"a": {"$lt": "B"}}
+    # string order depends on collation, bounds are kept
+    collation = Collation("en", strength=2)
+    assert optimize_query(query, collation) == query
+
+
+def test_optimize_equivalence():
+    rnd = random.Random(42)
+    documents = [random_document(rnd) for _ in range(200)]
+    for _ in range(500):
+        query = random_query(rnd)
+        optimized = optimize_query(query)
+        for document in documents:
+            assert matches(document, query) == matches(document, optimized), (
+                query,
+                optimized,
+                document,
+            )
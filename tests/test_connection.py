@@ -1,3 +1,4 @@
+import asyncio
 import os
 
 from chouodm.connection import (
@@ -7,9 +8,20 @@ from chouodm.connection import (
     _connections,
 )
 
+from chouodm.document import Document, DynamicCollectionDocument
+from chouodm.manager import ODMManager
+
 from motor.motor_asyncio import AsyncIOMotorClient
 
 
+class CachedBuilderDocument(Document):
+    name: str
+
+
+class CachedBuilderDynamicDocument(DynamicCollectionDocument):
+    name: str
+
+
 class TestWriteConnectionParams:
     def setup_method(self):
         connect("mongodb://127.0.0.1:27017", "test")
@@ -41,3 +53,37 @@ class TestWriteConnectionParams:
         assert motor_client.get_database("test") == AsyncIOMotorClient(
             "mongodb://127.0.0.1:27017"
         ).get_database("test")
+
+    def test_builder_cache(self):
+        builder = CachedBuilderDocument.Q()
+        assert CachedBuilderDocument.Q() is builder
+        assert CachedBuilderDocument.Qsync().builder is builder
+        dynamic = CachedBuilderDynamicDocument.Q("first")
+        assert CachedBuilderDynamicDocument.Q("first") is dynamic
+        assert CachedBuilderDynamicDocument.Q("second") is not dynamic
+
+        ODMManager.use(self.connection)
+        assert CachedBuilderDocument.Q() is not builder
+        assert CachedBuilderDynamicDocument.Q("first") is not dynamic
+
+    def test_builder_cache_per_event_loop(self):
+        async def get_builder():
+            return CachedBuilderDocument.Q()
+
+        builder = CachedBuilderDocument.Q()
+        loop = asyncio.new_event_loop()
+        try:
+            first = loop.run_until_complete(get_builder())
+            assert first is not builder
+            assert loop.run_until_complete(get_builder()) is first
+        finally:
+            loop.close()
+        assert asyncio.run(get_builder()) is not first
+        assert CachedBuilderDocument.Q() is builder
+
+    def test_builder_cache_after_fork(self):
+        builder = CachedBuilderDocument.Q()
+        # simulate first access in forked process
+        ODMManager.__pid__ = -1
+        assert CachedBuilderDocument.Q() is not builder
+        assert ODMManager.__pid__ == os.getpid()
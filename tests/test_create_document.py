@@ -2,7 +2,8 @@ import pytest
 import pytest_asyncio
 
 from chouodm.document import Document
-from msgspec import Struct
+from bson import ObjectId
+from msgspec import Struct, ValidationError
 
 
 class Config(Struct):
@@ -57,3 +58,37 @@ async def test_raise_with_field_mongo_model(connection):
         class Default(Document):
             name: str
             app: Application
+
+
+def test_codec_registry(connection):
+    class ChildApplication(Application):
+        version: int = 1
+
+    assert Application.__decoder__ is Application.__decoder__
+    assert ChildApplication.__decoder__ is not Application.__decoder__
+    child = ChildApplication.from_json(
+        b'{"name":"test","config":{},"lang":"python","version":2}'
+    )
+    assert child.version == 2
+    applications = Application.from_json_list(
+        b'[{"name":"a","config":{},"lang":"python"}]'
+    )
+    assert applications[0].name == "a"
+
+
+@pytest.mark.asyncio
+async def test_nested_struct_hydration(connection):
+    application = await Application.Q().find_one(name="test")
+    assert isinstance(application.config, Config)
+    assert application.config.path == "/home/"
+
+
+def test_new_without_json_round_trip(connection):
+    object_id = ObjectId()
+    application = Application.New(
+        name="test", config={"env": "prod"}, lang="python", _id=str(object_id)
+    )
+    assert application._id == object_id
+    assert application.config == Config(env="prod")
+    with pytest.raises(ValidationError):
+        Application.New(name=1, config=Config(), lang="python")
@@ -1,10 +1,24 @@
 import pytest
 import re
 
-from bson import Regex
+from bson import Decimal128, ObjectId, Regex, encode as bson_encode
+from bson.raw_bson import RawBSONDocument
+from pymongo import IndexModel
+from pymongo.collation import Collation
 
 from chouodm.document import Document
+from chouodm.errors import QueryValidationError
 from chouodm.query import ExtraQueryMapper
+from chouodm.query.extra import (
+    bulk_query_generator,
+    compile_regex,
+    merge_bulk_results,
+    prefix_upper_bound,
+    split_in_query,
+)
+from chouodm.query.pagination import sort_key
+from chouodm.tracking import changed_values, mark_saved
+from chouodm.validation import get_field_validator
 
 
 class User(Document):
@@ -14,6 +28,11 @@ class User(Document):
     date: str
 
 
+class TrackedUser(User):
+    class Config:
+        track_changes = True
+
+
 def test_in_extra_param():
     with pytest.raises(TypeError):
         ExtraQueryMapper(User, "name").query(["in"], (1, 3))
@@ -110,3 +129,157 @@ def test_exists_params():
 
     extra = ExtraQueryMapper(User, "counter").query(["exists"], False)
     assert extra == {"counter": {"$exists": False}}
+
+
+def test_compiled_field_validators():
+    assert set(User.__validators__) == {"_id", "id", "name", "counter", "date"}
+    validator = get_field_validator(User, "counter")
+    assert validator is User.__validators__["counter"]
+    assert validator.many([1, "2"]) == [1, 2]
+    with pytest.raises(QueryValidationError):
+        validator("not number")
+    with pytest.raises(AttributeError):
+        get_field_validator(User, "unknown")(1)
+
+
+class Tag(Document):
+    name: str
+
+    class Config:
+        collation = Collation(locale="en", strength=2)
+        indexes = [
+            IndexModel([("name", 1)], collation=Collation(locale="en", strength=2))
+        ]
+
+
+def test_string_params_escaped():
+    extra = ExtraQueryMapper(User, "name").query(["startswith"], "a.b*")
+    assert extra == {"name": {"$regex": Regex.from_native(re.compile(r"^a\.b\*"))}}
+    extra = ExtraQueryMapper(User, "name").query(["iendswith"], "(x)")
+    value = {"name": {"$regex": Regex.from_native(re.compile(r"\(x\)$", re.I))}}
+    assert extra == value
+    assert compile_regex("^test") is compile_regex("^test")
+
+
+def test_prefix_params():
+    extra = ExtraQueryMapper(User, "name").query(["prefix"], "ab")
+    assert extra == {"name": {"$gte": "ab", "$lt": "ac"}}
+    extra = ExtraQueryMapper(User, "name").query(["prefix"], "")
+    assert extra == {"name": {"$gte": ""}}
+    assert prefix_upper_bound("a\U0010ffff") == "b"
+    assert prefix_upper_bound("\ud7ff") == "\ue000"
+    with pytest.raises(TypeError):
+        ExtraQueryMapper(User, "name").query(["prefix"], 1)
+    extra = ExtraQueryMapper(Tag, "name").query(["prefix"], "ab")
+    assert extra == {"name": {"$regex": Regex.from_native(re.compile("^ab"))}}
+
+
+def test_iexact_params():
+    extra = ExtraQueryMapper(User, "name").query(["iexact"], "Ab")
+    assert extra == {"name": {"$regex": Regex.from_native(re.compile("^Ab$", re.I))}}
+    extra = ExtraQueryMapper(Tag, "name").query(["iexact"], "Ab")
+    assert extra == {"name": {"$eq": "Ab"}}
+
+
+def test_bulk_query_generator_upsert():
+    user = User(id="1", name="name", counter=1, date="2020-01-01", _id=ObjectId())
+    [operation] = bulk_query_generator([user], query_fields=["id"], upsert=True)
+    assert operation._filter == {"id": "1"}
+    assert operation._doc == {
+        "$set": {"name": "name", "counter": 1, "date": "2020-01-01"},
+        "$setOnInsert": {"_id": user._id},
+    }
+
+
+def test_merge_bulk_results():
+    first = {"nMatched": 2, "nModified": 1, "upserted": [{"index": 1, "_id": 1}]}
+    second = {
+        "nMatched": 1,
+        "nUpserted": 1,
+        "upserted": [{"index": 0, "_id": 2}],
+        "writeErrors": [{"index": 1, "code": 11000}],
+    }
+    merged = merge_bulk_results([(0, first), (5, second)])
+    assert merged["nMatched"] == 3
+    assert merged["nModified"] == 1
+    assert merged["nUpserted"] == 1
+    assert merged["upserted"] == [{"index": 1, "_id": 1}, {"index": 5, "_id": 2}]
+    assert merged["writeErrors"] == [{"index": 6, "code": 11000}]
+
+
+def test_changed_values():
+    object_id = ObjectId()
+    data = {"_id": object_id, "id": "1", "name": "a", "counter": 1, "date": "d"}
+    user = TrackedUser.from_bson(RawBSONDocument(bson_encode(data)))
+
+    def validate(data):
+        return data
+
+    fields = User.__struct_fields__
+    # tracking is opt-in
+    untracked = User.from_bson(RawBSONDocument(bson_encode(data)))
+    assert changed_values(untracked, fields, validate) is None
+    assert changed_values(user, fields, validate) == {}
+    user.counter = 2
+    assert changed_values(user, fields, validate) == {"counter": 2}
+    mark_saved(user, {"counter": 2})
+    assert changed_values(user, fields, validate) == {}
+    user.counter = 2.0
+    assert changed_values(user, fields, validate) == {"counter": 2.0}
+    new_user = User(id="1", name="a", counter=1, date="d")
+    assert changed_values(new_user, fields, validate) is None
+
+
+def test_split_in_query():
+    assert split_in_query({"name": {"$in": ["a", "b"]}}, 2) is None
+    values = ["a", "b", "a", "c", "d"]
+    query = {"name": {"$in": values, "$ne": "x"}, "counter": 1, "$or": [{"a": 1}]}
+    assert split_in_query(query, 2) == [
+        {"name": {"$in": ["a", "b"], "$ne": "x"}, "counter": 1, "$or": [{"a": 1}]},
+        {"name": {"$in": ["c", "d"], "$ne": "x"}, "counter": 1, "$or": [{"a": 1}]},
+    ]
+    # biggest $in is split
+    query = {"name": {"$in": values}, "date": {"$in": ["1", "2", "3"]}}
+    assert [q["name"]["$in"] for q in split_in_query(query, 2)] == [
+        ["a", "b"],
+        ["c", "d"],
+    ]
+    # bool values are not merged with equal numbers
+    query = {"flag": {"$in": [True, 1, 1, False, 0]}}
+    assert [q["flag"]["$in"] for q in split_in_query(query, 2)] == [
+        [True, 1],
+        [False, 0],
+    ]
+
+
+def test_sort_key():
+    rows = [
+        RawBSONDocument(bson_encode(data))
+        for data in (
+            {"v": "a"},
+            {"v": 2},
+            {"v": None},
+            {"v": True},
+            {"v": Decimal128("1.5")},
+            {"v": [3, "z"]},
+            {"v": []},
+            {},
+        )
+    ]
+    ascending = sorted(rows, key=lambda row: sort_key(row, ("v",), 1))
+    assert [row.get("v") for row in ascending] == [
+        [],
+        None,
+        None,
+        Decimal128("1.5"),
+        2,
+        [3, "z"],
+        "a",
+        True,
+    ]
+    descending = sorted(rows, key=lambda row: sort_key(row, ("v",), -1))
+    assert descending.index(rows[5]) > descending.index(rows[0])
+    # server order of these values is not known, chunks are not merged
+    assert sort_key(RawBSONDocument(bson_encode({"v": Regex("a")})), ("v",), 1) is None
+    array_path = RawBSONDocument(bson_encode({"v": [{"a": 1}]}))
+    assert sort_key(array_path, ("v.a",), 1) is None
@@ -1,9 +1,18 @@
+import asyncio
 from typing import List, Optional
 
 import pytest_asyncio
 import pytest
+from bson import ObjectId
+from bson.errors import InvalidId
+from bson.raw_bson import RawBSONDocument
 
 from chouodm.document import Document
+from chouodm.errors import QueryValidationError
+from chouodm.loader import DocumentLoader
+from chouodm.lookup import get_lookup_plan
+from chouodm.relation import RelationLoader
+from chouodm.tracking import get_snapshot
 from chouodm.types import Relation
 
 
@@ -26,6 +35,26 @@ class OptionalTestPublisher(Document):
     author: Optional[Relation[Author]] = None
 
 
+class Category(Document):
+    name: str
+
+
+class LinkedCategory(Category):
+    parent: Optional[Relation[Category]] = None
+
+    class Config:
+        collection_name = "category"
+
+
+class Shelf(Document):
+    name: str
+    books: List[Relation[Book]]
+    featured: Relation[Book]
+
+    class Config:
+        track_changes = True
+
+
 @pytest_asyncio.fixture(scope="session", autouse=True)
 async def relation_data(event_loop, connection):
     authors = [Author(name="Author1"), Author(name="Author2")]
@@ -55,11 +84,20 @@ async def relation_data(event_loop, connection):
     optional_publisher = await OptionalTestPublisher.Q().insert_one(
         name="test_publisher2", author=author2
     )
+    await Shelf(name="shelf1", books=[book], featured=book).save()
+    first = await LinkedCategory(name="first").save()
+    second = await LinkedCategory(
+        name="second", parent=Category.to_relation(first._id)
+    ).save()
+    first.parent = Category.to_relation(second._id)
+    await first.save()
     yield
     await Author.Q().drop_collection(force=True)
     await Book.Q().drop_collection(force=True)
     await Publish.Q().drop_collection(force=True)
     await OptionalTestPublisher.Q().drop_collection(force=True)
+    await Shelf.Q().drop_collection(force=True)
+    await Category.Q().drop_collection(force=True)
 
 
 @pytest.mark.asyncio
@@ -70,6 +108,50 @@ async def test_book_relation(connection):
     assert book_author == native_author
 
 
+@pytest.mark.asyncio
+async def test_relation_get_batched(connection):
+    books = (await Book.Q().find()).list
+    async with DocumentLoader() as loader:
+        authors = await asyncio.gather(*(book.author.get() for book in books))
+        assert loader.queries == 1
+        assert await books[0].author.get() is authors[0]
+        assert loader.queries == 1
+        assert await Author.Q().get_by_id(ObjectId()) is None
+        assert loader.queries == 2
+    for book, author in zip(books, authors):
+        assert author == await book.author.get()
+
+
+@pytest.mark.asyncio
+async def test_relation_get_batched_cancel(connection):
+    book = await Book.Q().find_one(title="first book from author1")
+    async with DocumentLoader() as loader:
+        cancelled = asyncio.ensure_future(book.author.get())
+        waiting = asyncio.ensure_future(book.author.get())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        results = await asyncio.gather(cancelled, waiting, return_exceptions=True)
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1].name == "Author1"
+        assert await book.author.get() is results[1]
+        assert loader.queries == 1
+
+
+@pytest.mark.asyncio
+async def test_relation_get_batched_invalid_id(connection):
+    book = await Book.Q().find_one(title="first book from author1")
+    async with DocumentLoader() as loader:
+        invalid, author = await asyncio.gather(
+            Author.Q().get_by_id("invalid"),
+            Author.Q().get_by_id(str(book.author.db_ref.id)),
+            return_exceptions=True,
+        )
+        # invalid _id fails only its own call
+        assert isinstance(invalid, InvalidId)
+        assert author.name == "Author1"
+        assert loader.queries == 1
+
+
 @pytest.mark.asyncio
 async def test_publish_relation(connection):
     publish = await Publish.Q().find_one(name="publush1", with_relations_objects=True)
@@ -83,6 +165,119 @@ async def test_publish_relation(connection):
     assert isinstance(publish2.books[0], Book)
 
 
+@pytest.mark.asyncio
+async def test_relation_loader_identity_map(connection):
+    publishers = (await Publish.Q().find()).list
+    loader = RelationLoader()
+    await loader.load(publishers)
+    # one query per relation level: books, then authors
+    assert loader.queries == 2
+    books = {id(book) for p in publishers for book in p.books}
+    shared = [b for p in publishers for b in p.books if b.title.endswith("author2")]
+    assert len(shared) == 2
+    assert shared[0] is shared[1]
+    assert len(books) == 2
+    assert all(isinstance(b.author, Author) for b in shared)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_relations(connection):
+    publish = await Publish.Q().find_one(name="publush1", prefetch=("books",))
+    assert isinstance(publish.books[0], Book)
+    assert isinstance(publish.books[0].author, Relation)
+
+    publish = await Publish.Q().find_one(name="publush1", prefetch=("books.author",))
+    assert isinstance(publish.books[0].author, Author)
+
+    publishers = (
+        await Publish.Q().find(with_relations_objects=True, max_depth=1)
+    ).list
+    books = [book for p in publishers for book in p.books]
+    assert all(isinstance(book, Book) for book in books)
+    assert all(isinstance(book.author, Relation) for book in books)
+
+    with pytest.raises(QueryValidationError):
+        await Publish.Q().find(prefetch=("books.title",))
+
+
+@pytest.mark.asyncio
+async def test_prefetch_cyclic_relations(connection):
+    # categories share collection, so parent of first is second and back
+    categories = (
+        await LinkedCategory.Q().find(
+            prefetch=("parent",), sort_fields=["name"], sort=1
+        )
+    ).list
+    first, second = categories
+    assert first.parent is second
+    # back reference to ancestor stays handle
+    assert isinstance(second.parent, Relation)
+    assert second.to_dict()["parent"]["id"] == first._id
+    assert first.data["parent"]["name"] == "second"
+    assert first.to_json()
+
+
+@pytest.mark.asyncio
+async def test_lookup_relation_strategy(connection):
+    params = {"with_relations_objects": True, "sort_fields": ["name"], "sort": 1}
+    expected = (await Publish.Q().find(**params)).list
+    publishers = (await Publish.Q().find(relation_strategy="lookup", **params)).list
+    assert publishers == expected
+    assert all(isinstance(book.author, Author) for book in publishers[1].books)
+
+    publish = await Publish.Q().find_one(
+        name="publush1", prefetch=("books",), relation_strategy="lookup"
+    )
+    assert isinstance(publish.books[0], Book)
+    assert isinstance(publish.books[0].author, Relation)
+
+    optional_publisher = await OptionalTestPublisher.Q().find_one(
+        name="test_publisher1", with_relations_objects=True, relation_strategy="lookup"
+    )
+    assert optional_publisher.author is None
+    with pytest.raises(QueryValidationError):
+        await Publish.Q().find(with_relations_objects=True, relation_strategy="join")
+
+
+def test_lookup_nested_pipeline_uses_let():
+    # localField together with pipeline needs MongoDB 5.0
+    stages = get_lookup_plan(Publish, ("books.author",)).stages
+    lookup = stages[1]["$lookup"]
+    assert "localField" not in lookup
+    assert lookup["let"] == {"ids": "$__lookup_books"}
+    assert lookup["pipeline"][0] == {
+        "$match": {"$expr": {"$in": ["$_id", {"$ifNull": ["$$ids", []]}]}}
+    }
+    author_lookup = lookup["pipeline"][2]["$lookup"]
+    assert author_lookup["localField"] == "__lookup_author"
+    assert "pipeline" not in author_lookup
+
+
+@pytest.mark.asyncio
+async def test_lookup_same_document_by_two_paths(connection):
+    shelf = await Shelf.Q().find_one(
+        name="shelf1", prefetch=("books", "featured.author"), relation_strategy="lookup"
+    )
+    assert isinstance(shelf.books[0].author, Relation)
+    assert isinstance(shelf.featured.author, Author)
+    # snapshot has no lookup fields, Book does not track changes
+    snapshot_fields = set(RawBSONDocument(get_snapshot(shelf).raw))
+    assert snapshot_fields == {"_id", "name", "books", "featured"}
+    assert get_snapshot(shelf.featured) is None
+
+
+@pytest.mark.asyncio
+async def test_iterate_with_relations(connection):
+    publishers = [
+        publish
+        async for publish in Publish.Q().iterate(
+            batch_size=1, with_relations_objects=True
+        )
+    ]
+    assert len(publishers) == 2
+    assert all(isinstance(book, Book) for p in publishers for book in p.books)
+
+
 @pytest.mark.asyncio
 async def test_find_relation_models_without_relations_objects(connection):
     book = await Book.Q().find_one(title__regex="1")